@@ -4,16 +4,18 @@ Reads nosleep_stories.json and renders a short-form (9:16) scrolling text MP4
 with TTS narration and optional background music.
 
 Requirements:
-    pip install moviepy Pillow edge-tts numpy pedalboard
+    pip install imageio-ffmpeg Pillow edge-tts numpy pedalboard
 
 Usage:
     python make_video.py --index 0                       # single story with narration (default)
     python make_video.py --all                           # render every story with narration
+    python make_video.py --all --jobs 4                  # render four stories at a time
     python make_video.py --index 0 --no-narration        # scroll only, no audio
     python make_video.py --index 0 --music spooky.mp3
     python make_video.py --index 0 --voice en-US-JennyNeural
     python make_video.py --index 0 --no-reverb
     python make_video.py --index 0 --max-words 400
+    python make_video.py --index 0 --hwaccel nvenc          # encode on an NVIDIA GPU
     python make_video.py --list
     python make_video.py --list-voices
 
@@ -24,16 +26,23 @@ Pass --no-narration for a silent scroll-only video.
 
 import argparse
 import asyncio
+import hashlib
 import json
 import math
+import os
 import random
+import re
+import subprocess
+import struct
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+import imageio_ffmpeg
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from moviepy import AudioFileClip, CompositeAudioClip, VideoClip, concatenate_audioclips
 
 # ── Video dimensions (portrait 9:16 for Shorts / Reels / TikTok) ────────────
 WIDTH = 1080
@@ -55,6 +64,20 @@ PARAGRAPH_GAP = 70               # extra pixels of space between paragraphs
 DEFAULT_SCROLL_SPEED = 50        # pixels per second
 MAX_VIDEO_DURATION   = 180       # seconds — YouTube Shorts limit (3 minutes)
 
+# ── Encoding ──────────────────────────────────────────────────────────────────
+X264_PRESET = "veryfast"     # ~3-5x faster than the default "medium" at a small bitrate cost
+X264_TUNE   = "stillimage"   # content is a still image scrolled vertically — no film grain / motion psy
+ENCODE_THREADS = 0           # libx264 threads per encode; 0 lets x264 pick (~1.5x logical cores)
+DEFAULT_HWACCEL = "auto"     # use a hardware H.264 encoder when one works, else libx264
+
+# Hardware H.264 encoders, in the order --hwaccel auto tries them: name → (encoder, flags).
+# Hardware encoders are much faster but need a higher bitrate for the same quality.
+HW_ENCODERS = {
+    "nvenc": ("h264_nvenc",        ["-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "4M", "-pix_fmt", "yuv420p"]),
+    "vt":    ("h264_videotoolbox", ["-b:v", "6M", "-pix_fmt", "yuv420p"]),
+    "qsv":   ("h264_qsv",          ["-preset", "veryfast", "-global_quality", "23", "-pix_fmt", "nv12"]),
+}
+
 # ── Audio ─────────────────────────────────────────────────────────────────────
 DEFAULT_VOICE        = "en-GB-RyanNeural"   # British male — dramatic, works well for horror
 DEFAULT_FEMALE_VOICE = "en-GB-SoniaNeural"  # British female — matches Ryan's accent
@@ -63,6 +86,9 @@ DEFAULT_TTS_PITCH = "-10Hz"            # voice pitch adjustment (-10Hz = noticea
 DEFAULT_REVERB    = True                # apply subtle reverb to narration by default
 MUSIC_FOLDER      = "horror_music"      # folder of music tracks to pick from randomly
 MUSIC_VOLUME      = 0.15               # background music level (0.0–1.0)
+TTS_CONCURRENCY   = 4                   # parallel edge-tts requests — more risks Microsoft throttling
+TTS_CHUNK_CHARS   = 1000                # sentences are packed into requests of about this size
+TTS_CACHE_DIR     = "tts_cache"         # narration MP3s and reverb WAVs, keyed by content hash
 
 # A few good voices to try:
 #   en-GB-RyanNeural         — British male, dramatic (default male)
@@ -118,14 +144,29 @@ DISPLAY_FONTS = [
     "October Crow.ttf",                                                         # fallback: same folder as script
 ]
 
+@lru_cache(maxsize=None)
+def _font_path(candidates: tuple[str, ...]) -> str | None:
+    """
+    First candidate font Pillow can open — each list is probed once, not once
+    per size. Bare names like "October Crow.ttf" resolve through Pillow's own
+    search of the system font folders, so they're tried rather than stat'd.
+    """
+    for path in candidates:
+        try:
+            ImageFont.truetype(path, 1)
+        except OSError:
+            continue
+        return path
+    return None
+
+
+@lru_cache(maxsize=16)
 def _load_font(size: int, bold: bool = False, display: bool = False,
                body: bool = False, italic: bool = False, bold_italic: bool = False) -> ImageFont.FreeTypeFont:
     if display:
-        for path in DISPLAY_FONTS:
-            try:
-                return ImageFont.truetype(path, size)
-            except OSError:
-                pass
+        path = _font_path(tuple(DISPLAY_FONTS))
+        if path:
+            return ImageFont.truetype(path, size)
         print("  Warning: October Crow font not found, falling back to bold Arial.")
     if body:
         if bold_italic:
@@ -136,36 +177,67 @@ def _load_font(size: int, bold: bool = False, display: bool = False,
             paths = BODY_FONTS_BOLD
         else:
             paths = BODY_FONTS
-        for path in paths:
-            try:
-                return ImageFont.truetype(path, size)
-            except OSError:
-                pass
-        print(f"  Warning: Roboto variant not found, falling back to system font.")
-    paths = WINDOWS_FONTS_BOLD if bold else WINDOWS_FONTS
-    for path in paths:
-        try:
+        path = _font_path(tuple(paths))
+        if path:
             return ImageFont.truetype(path, size)
-        except OSError:
-            pass
+        print(f"  Warning: Roboto variant not found, falling back to system font.")
+    path = _font_path(tuple(WINDOWS_FONTS_BOLD if bold else WINDOWS_FONTS))
+    if path:
+        return ImageFont.truetype(path, size)
     return ImageFont.load_default()
 
 
 # ── Text helpers ─────────────────────────────────────────────────────────────
 
+# Shared 1x1 canvas used only for text measurement
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+@lru_cache(maxsize=8192)
+def _text_width(text: str, font: ImageFont.FreeTypeFont) -> float:
+    """Pixel width of `text` in `font` — each (word, font) pair is shaped only once."""
+    return _MEASURE_DRAW.textlength(text, font=font)
+
+
+@lru_cache(maxsize=256)
+def _render_line(text: str, font: ImageFont.FreeTypeFont, color: tuple) -> tuple[Image.Image, int, int] | None:
+    """
+    Rasterise one line of text into a tight RGBA sprite, cached so repeated lines
+    (the fixed subscribe text, titles across a batch) are only drawn once.
+    Returns (sprite, dx, dy) — the sprite's offset from the text origin — or None if blank.
+    """
+    left, top, right, bottom = font.getbbox(text)
+    if right <= left or bottom <= top:
+        return None
+    sprite = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).text((-left, -top), text, font=font, fill=color)
+    return sprite, left, top
+
+
+def _paste_line(img: Image.Image, text: str, font: ImageFont.FreeTypeFont, color: tuple,
+                x: int, y: int) -> None:
+    """Draw `text` at (x, y) by pasting its cached sprite — lines never overlap, so no mask is needed."""
+    rendered = _render_line(text, font, color)
+    if rendered:
+        sprite, dx, dy = rendered
+        img.paste(sprite, (int(x) + dx, int(y) + dy))
+
+
 def _wrap(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list[str]:
-    dummy = ImageDraw.Draw(Image.new("RGB", (1, 1)))
-    lines, current = [], ""
+    space_w = _text_width(" ", font)
+    lines, current, current_w = [], [], 0.0
     for word in text.split():
-        candidate = f"{current} {word}".strip()
-        if dummy.textlength(candidate, font=font) <= max_width:
-            current = candidate
+        word_w = _text_width(word, font)
+        gap = space_w if current else 0.0
+        if current_w + gap + word_w <= max_width:
+            current.append(word)
+            current_w += gap + word_w
         else:
             if current:
-                lines.append(current)
-            current = word
+                lines.append(" ".join(current))
+            current, current_w = [word], word_w
     if current:
-        lines.append(current)
+        lines.append(" ".join(current))
     return lines
 
 
@@ -173,19 +245,22 @@ def _wrap(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list[str]:
 # Each word is tagged as (text, bold, italic, strikethrough)
 Word = tuple[str, bool, bool, bool]
 
+_SUPERSCRIPT = re.compile(r'\^(\S+)')
+_CODE_SPAN   = re.compile(r'`(.*?)`')
+# Markdown spans, longest match first
+_INLINE_SPAN = re.compile(r'(\*\*\*.*?\*\*\*|\*\*.*?\*\*|\*.*?\*|~~~.*?~~~|~~.*?~~|_.*?_)', re.DOTALL)
+
+
 def _parse_inline(text: str) -> list[Word]:
     """
     Parse inline markdown into (word, bold, italic, strikethrough) tuples.
     Supports: ***bold italic***, **bold**, *italic*, _italic_, ~~strikethrough~~.
     Strips: ^superscript, `code` markers.
     """
-    import re
-    text = re.sub(r'\^(\S+)', '', text)       # remove superscript
-    text = re.sub(r'`(.*?)`', r'\1', text)    # strip code backticks
+    text = _SUPERSCRIPT.sub('', text)       # remove superscript
+    text = _CODE_SPAN.sub(r'\1', text)      # strip code backticks
 
-    # Split on markdown spans, longest match first
-    pattern = r'(\*\*\*.*?\*\*\*|\*\*.*?\*\*|\*.*?\*|~~~.*?~~~|~~.*?~~|_.*?_)'
-    segments = re.split(pattern, text, flags=re.DOTALL)
+    segments = _INLINE_SPAN.split(text)
 
     result: list[Word] = []
     for seg in segments:
@@ -216,9 +291,8 @@ def _parse_inline(text: str) -> list[Word]:
 
 def _strip_markdown(text: str) -> str:
     """Strip markdown formatting symbols for clean TTS — keeps the words, drops the syntax."""
-    import re
-    text = re.sub(r'\^(\S+)', '', text)                                  # ^superscript
-    text = re.sub(r'`(.*?)`', r'\1', text)                              # `code`
+    text = _SUPERSCRIPT.sub('', text)                                   # ^superscript
+    text = _CODE_SPAN.sub(r'\1', text)                                  # `code`
     text = re.sub(r'\*\*\*(.*?)\*\*\*', r'\1', text, flags=re.DOTALL)  # ***bold italic***
     text = re.sub(r'\*\*(.*?)\*\*', r'\1', text, flags=re.DOTALL)      # **bold**
     text = re.sub(r'\*(.*?)\*', r'\1', text, flags=re.DOTALL)          # *italic*
@@ -240,60 +314,56 @@ def _pick_font(fonts: dict, bold: bool, italic: bool):
     return fonts['regular']
 
 
-def _wrap_markup(text: str, fonts: dict, max_width: int):
+# A wrapped body line: each word with its measured width, plus the line's total width
+MarkupLine = tuple[list[tuple[Word, float]], float]
+
+
+def _wrap_markup(text: str, fonts: dict, max_width: int) -> list[MarkupLine]:
     """
     Word-wrap markdown text respecting all inline formatting.
-    Returns list of lines, each a list of Word tuples.
+    Returns list of lines, each the line's (Word, width) pairs and its total pixel width —
+    measured once here so drawing never has to re-measure.
     """
     tagged_words = _parse_inline(text)
     if not tagged_words:
         return []
 
-    dummy = ImageDraw.Draw(Image.new("RGB", (1, 1)))
-    space_w = dummy.textlength(' ', font=fonts['regular'])
+    space_w = _text_width(' ', fonts['regular'])
     lines, current_line, current_w = [], [], 0.0
 
     for word in tagged_words:
         text_str, bold, italic, strike = word
         font = _pick_font(fonts, bold, italic)
-        word_w = dummy.textlength(text_str, font=font)
+        word_w = _text_width(text_str, font)
         gap = space_w if current_line else 0
         if current_w + gap + word_w <= max_width:
-            current_line.append(word)
+            current_line.append((word, word_w))
             current_w += gap + word_w
         else:
             if current_line:
-                lines.append(current_line)
-            current_line = [word]
+                lines.append((current_line, current_w))
+            current_line = [(word, word_w)]
             current_w = word_w
 
     if current_line:
-        lines.append(current_line)
+        lines.append((current_line, current_w))
     return lines
 
 
-def _line_pixel_width(line: list[Word], fonts: dict) -> float:
-    dummy = ImageDraw.Draw(Image.new("RGB", (1, 1)))
-    space_w = dummy.textlength(' ', font=fonts['regular'])
-    total = sum(dummy.textlength(w, font=_pick_font(fonts, b, i)) for w, b, i, _ in line)
-    return total + space_w * (len(line) - 1)
-
-
-def _draw_markup_line(draw, line: list[Word], cx, y, fonts: dict, color, font_size: int):
+def _draw_markup_line(draw, line: MarkupLine, cx, y, fonts: dict, color, font_size: int):
     """Draw a markup line centered on cx, rendering bold/italic/strikethrough."""
-    space_w = draw.textlength(' ', font=fonts['regular'])
-    total_w = _line_pixel_width(line, fonts)
+    words, total_w = line
+    space_w = _text_width(' ', fonts['regular'])
     x = cx - total_w / 2
 
-    for j, (word, bold, italic, strike) in enumerate(line):
+    for j, ((word, bold, italic, strike), word_w) in enumerate(words):
         font = _pick_font(fonts, bold, italic)
         draw.text((x, y), word, font=font, fill=color)
-        word_w = draw.textlength(word, font=font)
         if strike:
             mid_y = y + font_size // 2
             draw.line([(x, mid_y), (x + word_w, mid_y)], fill=color, width=2)
         x += word_w
-        if j < len(line) - 1:
+        if j < len(words) - 1:
             x += space_w
 
 
@@ -347,11 +417,13 @@ def _resolve_music(path: str) -> str | None:
     return path
 
 
+@lru_cache(maxsize=8)
 def load_background_image(path: str) -> np.ndarray:
     """
     Load and prepare a static background frame (WIDTH x HEIGHT).
     Crops the bottom watermark, resizes to fill the frame, then applies a dark overlay.
-    Returns a (HEIGHT, WIDTH, 3) uint8 numpy array.
+    Returns a read-only (HEIGHT, WIDTH, 3) uint8 numpy array — cached per path, so a
+    batch that keeps drawing the same few backgrounds decodes and resizes each once.
     """
     img = Image.open(path).convert("RGB")
 
@@ -368,18 +440,115 @@ def load_background_image(path: str) -> np.ndarray:
     top = (new_h - HEIGHT) // 2
     img = img.crop((left, top, left + WIDTH, top + HEIGHT))
 
-    # Dark overlay for text readability
-    overlay = Image.new("RGBA", img.size, (0, 0, 0, OVERLAY_OPACITY))
-    img = Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
+    # Dark overlay for text readability — compositing constant black at OVERLAY_OPACITY
+    # is a scale by (255 - opacity) / 255; the +128 and (x + (x >> 8)) >> 8 round
+    # exactly as Pillow's alpha_composite does
+    shaded = np.asarray(img, dtype=np.uint16) * (255 - OVERLAY_OPACITY) + 128
+    arr = ((shaded + (shaded >> 8)) >> 8).astype(np.uint8)
+    arr.flags.writeable = False
+    return arr
+
+
+# ── YUV 4:2:0 compositing ─────────────────────────────────────────────────────
+# Frames are composited straight into yuv420p (what H.264 encodes) so the blend
+# touches 1.5 bytes per pixel instead of 3 and ffmpeg skips the RGB conversion.
+
+# BT.601 limited range — the same conversion swscale applies to rgb24 input
+_YUV_MATRIX = np.array([
+    [ 65.481, 128.553,  24.966],
+    [-37.797, -74.203, 112.000],
+    [112.000, -93.786, -18.214],
+], dtype=np.float32).T / 255.0
+_YUV_OFFSET = np.array([16.0, 128.0, 128.0], dtype=np.float32)
+_Y_SIZE = WIDTH * HEIGHT   # bytes in a frame's luma plane
+_C_SIZE = _Y_SIZE // 4     # bytes in each chroma plane
+
+
+def _rgb_to_yuv(rgb: np.ndarray) -> np.ndarray:
+    """(H, W, 3) uint8 RGB → (H, W, 3) float32 Y, U, V."""
+    return rgb.astype(np.float32) @ _YUV_MATRIX + _YUV_OFFSET
+
+
+def _chroma_blocks(plane: np.ndarray) -> np.ndarray:
+    """Average the 2x2 blocks of an even-height (H, W, C) array down to 4:2:0 chroma resolution."""
+    h, w, c = plane.shape
+    return plane.reshape(h // 2, 2, w // 2, 2, c).mean(axis=(1, 3), dtype=np.float32)
 
-    return np.array(img)
+
+def _premultiply(rgba: np.ndarray) -> np.ndarray:
+    """(H, W, 4) uint8 RGBA → (H, W, 4) float32 alpha-premultiplied Y, U, V plus alpha (0–1)."""
+    alpha = rgba[:, :, 3:4].astype(np.float32) / 255.0
+    return np.concatenate([_rgb_to_yuv(rgba[:, :, :3]) * alpha, alpha], axis=2)
+
+
+def _to_fixed(premultiplied: np.ndarray, alpha: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Quantise a premultiplied text plane and its 0–1 alpha for the 8.8 fixed-point blend
+    in _blend_rows. Alpha is scaled to 0–256 (not 255) so the >> 8 lands opaque text
+    exactly on its value; the +128 folded into `text` makes the shift round.
+    Returns uint16 (text, inv_alpha).
+    """
+    text = (premultiplied * 256 + 128).astype(np.uint16)
+    inv_alpha = (256 - np.rint(alpha * 256)).astype(np.uint16)
+    return text, inv_alpha
+
+
+def _blend_rows(dst: np.ndarray, bg: np.ndarray, inv_alpha: np.ndarray, text: np.ndarray,
+                scratch: np.ndarray) -> None:
+    """
+    dst = (bg * inv_alpha + text) >> 8 in uint16, computed in place in `scratch` so no
+    per-frame temporaries are allocated. Every term stays below 2**16 (≤ 240·256 + 256).
+    """
+    np.multiply(bg, inv_alpha, out=scratch)
+    np.add(scratch, text, out=scratch)
+    np.right_shift(scratch, 8, out=scratch)
+    np.copyto(dst, scratch, casting="unsafe")
+
+
+def _prepare_text_layer(rgba: np.ndarray, band: int = 512):
+    """
+    Convert the RGBA text canvas into the fixed-point planes make_frame blends, a band of
+    rows at a time so the float32 intermediates stay a few MB however tall the story is.
+    Chroma is built for both scroll-offset parities: with phase 1 each block spans canvas
+    rows (2k-1, 2k), which is what a frame sees when its offset into the canvas is odd.
+    Returns (y, y_inv, chroma) where chroma[phase] = (u, v, inv_alpha) at half resolution.
+    """
+    h, w = rgba.shape[:2]
+    text_y     = np.empty((h, w), np.uint16)
+    text_y_inv = np.empty((h, w), np.uint16)
+    for r0 in range(0, h, band):
+        yuva = _premultiply(rgba[r0:r0 + band])
+        text_y[r0:r0 + band], text_y_inv[r0:r0 + band] = _to_fixed(yuva[:, :, 0], yuva[:, :, 3])
+
+    chroma = []
+    for phase in (0, 1):
+        n_blocks = (h + phase + 1) // 2
+        u, v, c_inv = (np.empty((n_blocks, w // 2), np.uint16) for _ in range(3))
+        for k0 in range(0, n_blocks, band // 2):
+            k1 = min(k0 + band // 2, n_blocks)
+            # Canvas rows a..b feed blocks k0..k1 — anything past the canvas edges is transparent
+            a, b = 2 * k0 - phase, 2 * k1 - phase
+            rows = np.zeros((b - a, w, 4), np.uint8)
+            rows[max(-a, 0):min(b, h) - a] = rgba[max(a, 0):min(b, h)]
+            blocks = _chroma_blocks(_premultiply(rows)[:, :, 1:])
+            u[k0:k1], c_inv[k0:k1] = _to_fixed(blocks[:, :, 0], blocks[:, :, 2])
+            v[k0:k1], _            = _to_fixed(blocks[:, :, 1], blocks[:, :, 2])
+        chroma.append((u, v, c_inv))
+    return text_y, text_y_inv, chroma
 
 
 AUTHOR_FONT_SIZE = BODY_FONT_SIZE - 6   # slightly smaller than body
 AUTHOR_COLOR     = (160, 160, 160)       # muted grey — understated credit
 
 
-def render_story_image(title: str, author: str, body: str) -> tuple[Image.Image, int]:
+def render_story_image(title: str, author: str, body: str) -> tuple[Image.Image, int, int]:
+    """
+    Render the transparent text layer for the whole scroll.
+    The canvas only spans the rows that actually contain text — from the title
+    down to the subscribe block. Returns (image, canvas_top, subscribe_center_y),
+    where canvas_top is the scroll position of the image's first row; everything
+    outside the canvas is plain background.
+    """
     title_font  = _load_font(TITLE_FONT_SIZE, bold=True, display=True)
     author_font = _load_font(AUTHOR_FONT_SIZE, body=True, italic=True)
     body_fonts = {
@@ -422,26 +591,27 @@ def render_story_image(title: str, author: str, body: str) -> tuple[Image.Image,
     # Body starts just below the bottom edge of the first frame
     body_start_y = HEIGHT + 20
 
-    # Total canvas: body start + body + gap + subscribe + trailing blank screen
-    total_height = body_start_y + body_height + 120 + subscribe_block_h + HEIGHT
+    # Canvas runs from the title down to the end of the subscribe block —
+    # the blank space above the title and after the last line is never stored
+    canvas_top   = title_y
+    total_height = body_start_y + body_height + 120 + subscribe_block_h - canvas_top
 
     img  = Image.new("RGBA", (WIDTH, total_height), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
 
     # Title — centered within safe area
-    y = title_y
+    y = title_y - canvas_top
     for line in title_lines:
-        w = draw.textlength(line, font=title_font)
-        x = center_x - w // 2
-        draw.text((x, y), line, font=title_font, fill=TITLE_COLOR)
+        w = _text_width(line, title_font)
+        _paste_line(img, line, title_font, TITLE_COLOR, center_x - w // 2, y)
         y += lh_title
 
     # Author credit — italic, centered, just below title
     aw = draw.textlength(author_text, font=author_font)
-    draw.text((center_x - aw // 2, author_y), author_text, font=author_font, fill=AUTHOR_COLOR)
+    draw.text((center_x - aw // 2, author_y - canvas_top), author_text, font=author_font, fill=AUTHOR_COLOR)
 
     # Body — starts just below the first visible frame, scrolls up into view
-    y = body_start_y
+    y = body_start_y - canvas_top
     for i, para_lines in enumerate(para_lines_list):
         for line in para_lines:
             _draw_markup_line(draw, line, center_x, y, body_fonts, TEXT_COLOR, BODY_FONT_SIZE)
@@ -453,21 +623,55 @@ def render_story_image(title: str, author: str, body: str) -> tuple[Image.Image,
     # Subscribe text — centered within safe area
     subscribe_start_y = y
     for line in subscribe_lines:
-        w = draw.textlength(line, font=title_font)
-        x = center_x - w // 2
-        draw.text((x, y), line, font=title_font, fill=TITLE_COLOR)
+        w = _text_width(line, title_font)
+        _paste_line(img, line, title_font, TITLE_COLOR, center_x - w // 2, y)
         y += lh_title
 
-    subscribe_center_y = subscribe_start_y + subscribe_block_h // 2
+    subscribe_center_y = canvas_top + subscribe_start_y + subscribe_block_h // 2
 
-    return img, subscribe_center_y
+    return img, canvas_top, subscribe_center_y
 
 
 # ── TTS narration ─────────────────────────────────────────────────────────────
 
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_for_tts(text: str, max_chars: int = TTS_CHUNK_CHARS) -> list[str]:
+    """Split narration on sentence boundaries, packing sentences into chunks of ~max_chars."""
+    chunks, current = [], ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
 async def _tts(text: str, voice: str, path: str, rate: str, pitch: str) -> None:
+    """
+    Synthesise `text` to `path`. Long narration is split into sentence chunks that
+    are synthesised concurrently (at most TTS_CONCURRENCY at once) and then joined.
+    """
     import edge_tts
-    await edge_tts.Communicate(text, voice, rate=rate, pitch=pitch).save(path)
+    chunks = _split_for_tts(text)
+    if len(chunks) <= 1:
+        await edge_tts.Communicate(text, voice, rate=rate, pitch=pitch).save(path)
+        return
+
+    limit = asyncio.Semaphore(TTS_CONCURRENCY)
+
+    async def _synth(chunk: str, part_path: str) -> None:
+        async with limit:
+            await edge_tts.Communicate(chunk, voice, rate=rate, pitch=pitch).save(part_path)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parts = [str(Path(tmp_dir) / f"{i:04d}.mp3") for i in range(len(chunks))]
+        await asyncio.gather(*(_synth(c, p) for c, p in zip(chunks, parts)))
+        _concat_mp3(parts, path)
 
 
 def generate_narration(text: str, voice: str, path: str,
@@ -476,24 +680,78 @@ def generate_narration(text: str, voice: str, path: str,
     asyncio.run(_tts(text, voice, path, rate, pitch))
 
 
+def cached_narration(text: str, voice: str,
+                     rate: str = DEFAULT_TTS_RATE,
+                     pitch: str = DEFAULT_TTS_PITCH) -> str:
+    """
+    Return the path of a narration MP3 for `text`, synthesising it only on a cache miss.
+    Files live in TTS_CACHE_DIR named by sha256(voice, rate, pitch, text), so re-rendering
+    the same story skips edge-tts entirely. Cached files are never deleted by the renderer.
+    """
+    key = hashlib.sha256(f"{voice}\0{rate}\0{pitch}\0{text}".encode()).hexdigest()
+    cache_dir = Path(TTS_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{key}.mp3"
+    if path.exists():
+        print(f"  Narration : cached ({path.name[:12]}…)")
+        return str(path)
+
+    # Synthesise next to the cache entry, then rename — a crash never leaves a partial hit
+    with tempfile.NamedTemporaryFile(suffix=".mp3", dir=cache_dir, delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        generate_narration(text, voice, tmp_path, rate=rate, pitch=pitch)
+        os.replace(tmp_path, path)
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+    return str(path)
+
+
 async def _list_voices() -> None:
     import edge_tts
     voices = await edge_tts.list_voices()
     en_voices = [v for v in voices if v["Locale"].startswith("en-")]
-    print(f"\n{'Name':<35} {'Gender':<8} Locale")
-    print("-" * 60)
-    for v in sorted(en_voices, key=lambda x: x["ShortName"]):
-        print(f"{v['ShortName']:<35} {v['Gender']:<8} {v['Locale']}")
+    lines = [f"\n{'Name':<35} {'Gender':<8} Locale", "-" * 60]
+    lines += [f"{v['ShortName']:<35} {v['Gender']:<8} {v['Locale']}"
+              for v in sorted(en_voices, key=lambda x: x["ShortName"])]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ── Audio helpers ─────────────────────────────────────────────────────────────
 
-def _loop_audio(clip: AudioFileClip, duration: float) -> AudioFileClip:
-    """Repeat `clip` until it covers `duration` seconds, then trim."""
-    if clip.duration >= duration:
-        return clip.subclipped(0, duration)
-    repeats = int(duration / clip.duration) + 1
-    return concatenate_audioclips([clip] * repeats).subclipped(0, duration)
+def _audio_duration(path: str) -> float:
+    """Duration of an audio file in seconds, read from the header ffmpeg prints for it."""
+    result = subprocess.run([imageio_ffmpeg.get_ffmpeg_exe(), "-i", path], capture_output=True, text=True)
+    match = re.search(r"Duration: (\d+):(\d+):(\d+\.\d+)", result.stderr)
+    if not match:
+        raise RuntimeError(f"Could not read the duration of {path}")
+    h, m, sec = int(match.group(1)), int(match.group(2)), float(match.group(3))
+    return h * 3600 + m * 60 + sec
+
+
+def _concat_mp3(parts: list[str], output_path: str) -> None:
+    """Join MP3 files end to end with ffmpeg's concat demuxer (stream copy, no re-encode)."""
+    list_path = Path(parts[0]).with_name("concat.txt")
+    list_path.write_text(
+        "".join(f"file '{Path(p).as_posix()}'\n" for p in parts), encoding="utf-8"
+    )
+    subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+         "-f", "concat", "-safe", "0", "-i", str(list_path), "-c", "copy", output_path],
+        check=True, capture_output=True,
+    )
+
+
+# Narration post-processing chain — also hashed into the reverb cache key, so
+# changing a setting re-processes instead of reusing a stale file
+REVERB_LOWPASS_HZ = 4000     # muffle highs — distant/underground feel
+REVERB_SETTINGS = dict(
+    room_size=0.65,    # large cavernous space
+    damping=0.45,      # less damping — longer, brighter tail
+    wet_level=0.28,    # more reverb in the mix
+    dry_level=0.72,    # less dry signal
+    freeze_mode=0.0,
+)
 
 
 def apply_audio_effects(input_path: str, output_path: str) -> None:
@@ -510,14 +768,8 @@ def apply_audio_effects(input_path: str, output_path: str) -> None:
         sample_rate = f.samplerate
 
     board = Pedalboard([
-        LowpassFilter(cutoff_frequency_hz=4000),  # muffle highs — distant/underground feel
-        Reverb(
-            room_size=0.65,    # large cavernous space
-            damping=0.45,      # less damping — longer, brighter tail
-            wet_level=0.28,    # more reverb in the mix
-            dry_level=0.72,    # less dry signal
-            freeze_mode=0.0,
-        ),
+        LowpassFilter(cutoff_frequency_hz=REVERB_LOWPASS_HZ),
+        Reverb(**REVERB_SETTINGS),
     ])
     processed = board(audio, sample_rate)
 
@@ -525,6 +777,31 @@ def apply_audio_effects(input_path: str, output_path: str) -> None:
         f.write(processed)
 
 
+def cached_reverb(input_path: str) -> str:
+    """
+    Return the path of a reverb-processed WAV for `input_path`, running pedalboard only
+    on a cache miss. Keyed by sha256(audio bytes, reverb settings) in TTS_CACHE_DIR, so
+    toggling --no-reverb never invalidates the narration MP3 it was made from.
+    """
+    digest = hashlib.sha256(Path(input_path).read_bytes())
+    digest.update(f"\0{REVERB_LOWPASS_HZ}\0{sorted(REVERB_SETTINGS.items())}".encode())
+    cache_dir = Path(TTS_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{digest.hexdigest()}_reverb.wav"
+    if path.exists():
+        print(f"  Reverb : cached ({path.name[:12]}…)")
+        return str(path)
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", dir=cache_dir, delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        apply_audio_effects(input_path, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+    return str(path)
+
+
 # ── Narrator gender detection ─────────────────────────────────────────────────
 
 def _detect_narrator_gender(title: str, body: str) -> str:
@@ -537,7 +814,6 @@ def _detect_narrator_gender(title: str, body: str) -> str:
       +1 per match  : weaker relational indicators (my boyfriend / my girlfriend)
       +3 per match  : explicit self-identification ("I'm a woman", "as a man", etc.)
     """
-    import re
     text = (title + " " + body).lower()
 
     female_score = 0
@@ -575,6 +851,11 @@ def _detect_narrator_gender(title: str, body: str) -> str:
     return 'neutral'
 
 
+def _voice_for_gender(gender: str) -> str:
+    """Default narrator voice for a _detect_narrator_gender result (neutral uses the male voice)."""
+    return DEFAULT_FEMALE_VOICE if gender == 'female' else DEFAULT_VOICE
+
+
 # ── TTS rate helpers ──────────────────────────────────────────────────────────
 
 def _rate_to_multiplier(rate_str: str) -> float:
@@ -589,8 +870,106 @@ def _multiplier_to_rate(mult: float) -> str:
     return f"{'+' if pct >= 0 else ''}{pct:.0f}%"
 
 
+# ── Encoding ──────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def _hw_encoder_works(encoder: str) -> bool:
+    """Trial-encode a few blank frames — an encoder can be compiled in without the hardware present."""
+    result = subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error",
+         "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+         "-c:v", encoder, "-f", "null", "-"],
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+def resolve_hwaccel(hwaccel: str) -> str:
+    """
+    Turn a --hwaccel choice into a concrete encoder name ('nvenc', 'vt', 'qsv' or 'cpu').
+    'auto' probes `ffmpeg -encoders` once and picks the first hardware encoder that works.
+    """
+    if hwaccel != "auto":
+        return hwaccel
+    listed = subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), "-hide_banner", "-encoders"],
+        capture_output=True, text=True,
+    ).stdout
+    for name, (encoder, _) in HW_ENCODERS.items():
+        if encoder in listed and _hw_encoder_works(encoder):
+            return name
+    return "cpu"
+
+
+def _ffmpeg_command(output_path: str, duration: float, narration_path: str | None,
+                    music_path: str | None, music_volume: float,
+                    hwaccel: str = "cpu",
+                    encode_threads: int = ENCODE_THREADS) -> list[str]:
+    """
+    Build the ffmpeg argv that encodes raw yuv420p frames read from stdin.
+    Narration and background music are mixed by ffmpeg itself (amix), with the
+    music looped via -stream_loop so it always covers the full duration.
+    """
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "yuv420p", "-s", f"{WIDTH}x{HEIGHT}",
+        "-r", str(FPS), "-i", "-",
+    ]
+    if narration_path:
+        cmd += ["-i", narration_path]
+    if music_path:
+        cmd += ["-stream_loop", "-1", "-i", music_path]
+
+    if narration_path and music_path:
+        # normalize=0 keeps the narration at full level (amix halves each input by default)
+        mix = f"[1:a][2:a]amix=inputs=2:duration=first:weights='1 {music_volume}':normalize=0[a]"
+        cmd += ["-filter_complex", mix, "-map", "0:v", "-map", "[a]"]
+    elif music_path:
+        cmd += ["-filter_complex", f"[1:a]volume={music_volume}[a]", "-map", "0:v", "-map", "[a]"]
+    elif narration_path:
+        cmd += ["-map", "0:v", "-map", "1:a"]
+
+    if hwaccel in HW_ENCODERS:
+        encoder, flags = HW_ENCODERS[hwaccel]
+        cmd += ["-c:v", encoder, *flags]
+    else:
+        cmd += [
+            "-c:v", "libx264", "-preset", X264_PRESET, "-tune", X264_TUNE,
+            "-threads", str(encode_threads), "-pix_fmt", "yuv420p",
+        ]
+    cmd += ["-movflags", "+faststart"]
+    if narration_path or music_path:
+        cmd += ["-c:a", "aac"]
+    cmd += ["-t", f"{duration:.3f}", output_path]
+    return cmd
+
+
 # ── Main video builder ────────────────────────────────────────────────────────
 
+def _trim_body(body: str, max_words: int | None) -> str:
+    """Cut `body` to its first `max_words` words (plus an ellipsis) when it is longer."""
+    if max_words:
+        words = body.split()
+        if len(words) > max_words:
+            return " ".join(words[:max_words]) + "..."
+    return body
+
+
+def prefetch_narration(story: dict, voice: str | None, max_words: int | None,
+                       tts_rate: str = DEFAULT_TTS_RATE,
+                       tts_pitch: str = DEFAULT_TTS_PITCH) -> None:
+    """
+    Warm the TTS cache with the narration create_video will ask for first, so batch mode
+    can synthesise the next story while the current one encodes. Uses the same trimming,
+    voice choice and text as create_video; a speed-up re-generation still happens there.
+    """
+    title = story["title"]
+    body = _trim_body(story["body"], max_words)
+    if voice is None:
+        voice = _voice_for_gender(_detect_narrator_gender(title, body))
+    cached_narration(f"{title}. {_strip_markdown(body)}", voice, rate=tts_rate, pitch=tts_pitch)
+
+
 def create_video(
     story: dict,
     output_path: str,
@@ -605,17 +984,15 @@ def create_video(
     tts_rate: str = DEFAULT_TTS_RATE,
     tts_pitch: str = DEFAULT_TTS_PITCH,
     reverb: bool = DEFAULT_REVERB,
+    hwaccel: str = "cpu",
+    encode_threads: int = ENCODE_THREADS,
 ) -> None:
     if scroll_speed is None:
         scroll_speed = DEFAULT_SCROLL_SPEED
     title = story["title"]
-    body = story["body"]
-
-    if max_words:
-        words = body.split()
-        if len(words) > max_words:
-            body = " ".join(words[:max_words]) + "..."
-            print(f"  Trimmed body to {max_words} words")
+    body = _trim_body(story["body"], max_words)
+    if body != story["body"]:
+        print(f"  Trimmed body to {max_words} words")
 
     print(f'\nRendering: "{title}"')
     print(f"  Words  : {len(body.split())}")
@@ -624,51 +1001,45 @@ def create_video(
     if music_path:
         music_path = _resolve_music(music_path)
 
-    audio = None
+    narration_path = None   # final narration audio handed to ffmpeg
 
-    # ── Render image first so max_scroll is known before TTS ─────────────────
+    # ── Render the image on a worker thread while TTS runs ───────────────────
+    # The two only meet when scroll speed is computed; edge-tts spends most of
+    # its time waiting on the network, so the FreeType work overlaps it.
     background_path = _resolve_background(background_path)
-    bg_arr = load_background_image(background_path)
-    bg_float = bg_arr.astype(np.float32)
-
     author = story.get("author", "unknown")
-    img, subscribe_center_y = render_story_image(title, author, body)
-    text_arr = np.array(img)
-    # Stop scrolling when the subscribe text is centred on screen
-    max_scroll = max(0, subscribe_center_y - HEIGHT // 2)
-
-    # Pre-convert entire text layer to float32 once — avoids per-frame conversions
-    text_rgb_float = text_arr[:, :, :3].astype(np.float32)
-    text_alpha     = text_arr[:, :, 3:4].astype(np.float32) / 255.0
-    text_inv_alpha = 1.0 - text_alpha
+    render_pool = ThreadPoolExecutor(max_workers=1)
+    image_future = render_pool.submit(render_story_image, title, author, body)
+    render_pool.shutdown(wait=False)  # the submitted render still runs to completion
+
+    bg_yuv = _rgb_to_yuv(load_background_image(background_path))
+    bg_u, bg_v = np.moveaxis(_chroma_blocks(bg_yuv[:, :, 1:]), 2, 0)
+    # The untouched background as one packed yuv420p frame, rounded once,
+    # plus uint16 copies of its planes for the fixed-point blend
+    bg_frame = np.concatenate([(p + 0.5).astype(np.uint8).ravel() for p in (bg_yuv[:, :, 0], bg_u, bg_v)])
+    bg_y = bg_frame[:_Y_SIZE].reshape(HEIGHT, WIDTH).astype(np.uint16)
+    bg_u = bg_frame[_Y_SIZE:_Y_SIZE + _C_SIZE].reshape(HEIGHT // 2, WIDTH // 2).astype(np.uint16)
+    bg_v = bg_frame[_Y_SIZE + _C_SIZE:].reshape(HEIGHT // 2, WIDTH // 2).astype(np.uint16)
+    del bg_yuv
 
     # Auto-select voice based on narrator gender unless overridden via --voice
     if voice is None:
         gender = _detect_narrator_gender(title, body)
-        if gender == 'female':
-            voice = DEFAULT_FEMALE_VOICE
-            print(f"  Gender : female detected → {voice}")
-        else:
-            voice = DEFAULT_VOICE
-            print(f"  Gender : {'neutral' if gender == 'neutral' else 'male'} detected → {voice}")
+        voice = _voice_for_gender(gender)
+        print(f"  Gender : {gender} detected → {voice}")
     else:
         print(f"  Voice  : {voice} (manual override)")
 
-    reverb_path = None  # track extra temp file for cleanup
     if narration:
         effective_rate = tts_rate
         print(f"  Voice  : {voice}  (rate={effective_rate}, pitch={tts_pitch})")
 
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-            tts_path = tmp.name
+        narration_text = f"{title}. {_strip_markdown(body)}"
 
         print("  Generating narration... (this may take a moment)")
-        generate_narration(f"{title}. {_strip_markdown(body)}", voice, tts_path,
-                           rate=effective_rate, pitch=tts_pitch)
+        tts_path = cached_narration(narration_text, voice, rate=effective_rate, pitch=tts_pitch)
 
-        _raw_clip = AudioFileClip(tts_path)
-        raw_duration = _raw_clip.duration
-        _raw_clip.close()
+        raw_duration = _audio_duration(tts_path)
 
         # If narration is too long, speed up the voice to fit.
         # We target 6s under max_duration to leave headroom for reverb tail and
@@ -680,56 +1051,52 @@ def create_video(
             effective_rate = _multiplier_to_rate(new_mult)
             print(f"  Narration too long ({raw_duration:.1f}s) — "
                   f"re-generating at {effective_rate} to fit under {max_duration:.0f}s")
-            Path(tts_path).unlink(missing_ok=True)
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-                tts_path = tmp.name
-            generate_narration(f"{title}. {_strip_markdown(body)}", voice, tts_path,
-                               rate=effective_rate, pitch=tts_pitch)
+            tts_path = cached_narration(narration_text, voice, rate=effective_rate, pitch=tts_pitch)
 
             # Re-verify: rate-string rounding can still cause a small overrun.
             # If so, do one corrective pass targeting a harder floor.
-            _verify = AudioFileClip(tts_path)
-            regen_duration = _verify.duration
-            _verify.close()
+            regen_duration = _audio_duration(tts_path)
             if regen_duration > tts_target:
                 speedup2 = regen_duration / (tts_target - 3)
                 new_mult2 = _rate_to_multiplier(effective_rate) * speedup2
                 effective_rate = _multiplier_to_rate(new_mult2)
-                Path(tts_path).unlink(missing_ok=True)
-                with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-                    tts_path = tmp.name
                 print(f"  Correcting rate rounding — re-generating at {effective_rate}")
-                generate_narration(f"{title}. {_strip_markdown(body)}", voice, tts_path,
-                                   rate=effective_rate, pitch=tts_pitch)
+                tts_path = cached_narration(narration_text, voice, rate=effective_rate, pitch=tts_pitch)
 
         # Optionally apply reverb post-processing
         if reverb:
             print("  Applying reverb...")
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp2:
-                reverb_path = tmp2.name
-            apply_audio_effects(tts_path, reverb_path)
-            narration_clip = AudioFileClip(reverb_path)
+            narration_path = cached_reverb(tts_path)
         else:
-            narration_clip = AudioFileClip(tts_path)
+            narration_path = tts_path
+
+    img, canvas_top, subscribe_center_y = image_future.result()
+    del image_future
+    # asarray wraps Pillow's exported buffer instead of copying it a second time;
+    # the view is read-only, which is fine — it is only read below
+    text_arr = np.asarray(img)
+    assert text_arr.dtype == np.uint8 and text_arr.shape == (img.height, img.width, 4)
+    canvas_h = text_arr.shape[0]
+    # Stop scrolling when the subscribe text is centred on screen
+    max_scroll = max(0, subscribe_center_y - HEIGHT // 2)
 
-        duration = narration_clip.duration
+    # Pre-convert the text layer to premultiplied YUV once, quantised to uint16 fixed
+    # point — each frame is then (bg * (256 - alpha) + text) >> 8 per plane. The RGBA
+    # canvas is dropped afterwards; only these planes stay resident while encoding.
+    text_y, text_y_inv, text_chroma = _prepare_text_layer(text_arr)
+    del img, text_arr
+
+    if narration:
+        duration = _audio_duration(narration_path)
         # Hard-clamp to max_duration: rate-string rounding and reverb tail can both
         # push the final clip slightly over the limit even after the speedup pass.
-        if duration > max_duration:
-            duration = max_duration
-            narration_clip = narration_clip.subclipped(0, duration)
+        # ffmpeg trims the narration to this length via -t.
+        duration = min(duration, max_duration)
         print(f"  Duration : {duration:.1f}s  ({duration/60:.1f} min)")
 
         # Scroll speed exactly matches narration — text and audio finish together
         scroll_speed = max_scroll / duration
         print(f"  Scroll speed : {scroll_speed:.1f} px/s (auto)")
-
-        if music_path:
-            bg = AudioFileClip(music_path)
-            bg = _loop_audio(bg, duration).with_volume_scaled(music_volume)
-            audio = CompositeAudioClip([narration_clip, bg])
-        else:
-            audio = narration_clip
     else:
         print("  Narration : off")
         # Auto-increase speed if needed to stay within max_duration
@@ -740,42 +1107,91 @@ def create_video(
         duration = min(max_scroll / scroll_speed, max_duration)
         print(f"  Scroll speed : {scroll_speed} px/s")
         print(f"  Duration : {duration:.1f}s  ({duration/60:.1f} min)")
-        if music_path:
-            bg = AudioFileClip(music_path)
-            bg = _loop_audio(bg, duration).with_volume_scaled(music_volume)
-            audio = bg
 
     print(f"  Output : {output_path}\n")
 
     total_frames = int(duration * FPS)
+    # Scroll position of every frame, computed in one pass
+    scroll_offsets = np.minimum((np.arange(total_frames) / FPS * scroll_speed).astype(np.int64), max_scroll)
     _rendered = [0]
-
-    def make_frame(t: float):
-        y = min(int(t * scroll_speed), max_scroll)
+    _last = [None, None]   # (scroll offset, frame) of the previous call
+
+    # One output frame and scratch planes, reused for every frame — the buffer
+    # is fully written to ffmpeg before the next frame overwrites it
+    frame   = np.empty_like(bg_frame)
+    y_plane = frame[:_Y_SIZE].reshape(HEIGHT, WIDTH)
+    u_plane = frame[_Y_SIZE:_Y_SIZE + _C_SIZE].reshape(HEIGHT // 2, WIDTH // 2)
+    v_plane = frame[_Y_SIZE + _C_SIZE:].reshape(HEIGHT // 2, WIDTH // 2)
+    y_scratch = np.empty((HEIGHT, WIDTH), np.uint16)
+    c_scratch = np.empty((HEIGHT // 2, WIDTH // 2), np.uint16)
+
+    def make_frame(y: int):
         _rendered[0] += 1
         if _rendered[0] % 30 == 0 or _rendered[0] == total_frames:
             pct = _rendered[0] / total_frames * 100
             print(f"\r  Rendering : {pct:.0f}%  ({_rendered[0]}/{total_frames} frames)", end="", flush=True)
-        return (bg_float * text_inv_alpha[y:y+HEIGHT] + text_rgb_float[y:y+HEIGHT] * text_alpha[y:y+HEIGHT]).astype(np.uint8)
-
-    clip = VideoClip(make_frame, duration=duration)
-    if audio is not None:
-        clip = clip.with_audio(audio)
-
-    clip.write_videofile(
-        output_path,
-        fps=FPS,
-        codec="libx264",
-        audio_codec="aac",
-        logger=None,
-    )
-    clip.close()
+        # Sub-pixel steps and the hold at max_scroll repeat the same offset — reuse
+        # that frame rather than compositing it again (x264 skip-codes repeats cheaply)
+        if y == _last[0]:
+            return _last[1]
+        np.copyto(frame, bg_frame)
+
+        # Only the rows covered by the text canvas need blending — the rest is background.
+        # Frame row r shows canvas row r + offset.
+        offset = y - canvas_top
+        top    = max(offset, 0)
+        bottom = min(offset + HEIGHT, canvas_h)
+        if top < bottom:
+            rows = slice(top - offset, bottom - offset)
+            _blend_rows(y_plane[rows], bg_y[rows], text_y_inv[top:bottom], text_y[top:bottom],
+                        y_scratch[rows])
+
+        # Same for chroma, in half-resolution rows of the block grid matching this parity
+        phase = offset % 2
+        text_u, text_v, text_c_inv = text_chroma[phase]
+        offset = (offset + phase) // 2
+        top    = max(offset, 0)
+        bottom = min(offset + HEIGHT // 2, len(text_c_inv))
+        if top < bottom:
+            rows = slice(top - offset, bottom - offset)
+            _blend_rows(u_plane[rows], bg_u[rows], text_c_inv[top:bottom], text_u[top:bottom],
+                        c_scratch[rows])
+            _blend_rows(v_plane[rows], bg_v[rows], text_c_inv[top:bottom], text_v[top:bottom],
+                        c_scratch[rows])
+        _last[:] = [y, frame]
+        return frame
+
+    # Frames are piped straight into ffmpeg as raw yuv420p; it encodes and muxes the audio
+    cmd = _ffmpeg_command(output_path, duration, narration_path, music_path, music_volume,
+                          hwaccel, encode_threads)
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    finished = False
+    try:
+        try:
+            for y in scroll_offsets:
+                # Frames are one packed yuv420p buffer, so the pipe can take the
+                # array's own memory — no .tobytes() copy per frame
+                buf = make_frame(int(y))
+                assert buf.flags.c_contiguous and buf.nbytes == _Y_SIZE + 2 * _C_SIZE
+                proc.stdin.write(buf.data)
+            proc.stdin.close()
+        except OSError as exc:
+            # ffmpeg exited early (BrokenPipeError; EINVAL on Windows) — its stderr says why
+            proc.kill()
+            stderr = proc.stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed: {stderr or exc}") from exc
+        stderr = proc.stderr.read().decode(errors="replace").strip()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr}")
+        finished = True
+    finally:
+        if not finished:
+            # Reap ffmpeg and drop the truncated mp4 so it can't pass for a finished render
+            proc.kill()
+            proc.wait()
+            Path(output_path).unlink(missing_ok=True)
     print()  # end the progress line
 
-    if narration:
-        Path(tts_path).unlink(missing_ok=True)
-        if reverb_path:
-            Path(reverb_path).unlink(missing_ok=True)
     print(f"\nDone! Saved to: {output_path}")
 
 
@@ -792,6 +1208,58 @@ def load_stories(json_path: str) -> list[dict]:
     return data
 
 
+RENDER_MANIFEST = "render_manifest.json"  # in VIDEO_OUTPUT_FOLDER: video filename → input fingerprint
+
+
+def render_fingerprint(story: dict, settings: dict) -> str:
+    """Short hash of everything that shapes a render — the story text plus the render settings."""
+    inputs = {key: story.get(key) for key in ("title", "author", "body")} | settings
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _load_manifest(out_dir: Path) -> dict:
+    path = out_dir / RENDER_MANIFEST
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(out_dir: Path, manifest: dict) -> None:
+    path = out_dir / RENDER_MANIFEST
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _is_finished_mp4(path: Path) -> bool:
+    """
+    True if the file's top-level MP4 boxes include 'moov'. ffmpeg writes that
+    index only once the encode completes, so a crashed render never has one.
+    """
+    try:
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            offset = 0
+            while offset + 8 <= size:
+                f.seek(offset)
+                header = f.read(16)
+                box_size, box_type = struct.unpack(">I4s", header[:8])
+                if box_type == b"moov":
+                    return True
+                if box_size == 1:    # 64-bit size follows the type
+                    box_size = struct.unpack(">Q", header[8:16])[0]
+                elif box_size == 0:  # box runs to the end of the file
+                    break
+                if box_size < 8:
+                    break
+                offset += box_size
+    except (OSError, struct.error):
+        pass
+    return False
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate a scrolling nosleep video with narration and music."
@@ -836,8 +1304,17 @@ def main():
         "--background", default=DEFAULT_BACKGROUND,
         help=f"Path to a background image file, or a folder to pick from randomly (default: '{DEFAULT_BACKGROUND}')"
     )
+    parser.add_argument(
+        "--hwaccel", choices=["auto", "nvenc", "vt", "qsv", "cpu"], default=DEFAULT_HWACCEL,
+        help="H.264 encoder: NVIDIA NVENC, Apple VideoToolbox, Intel Quick Sync, or libx264 on the CPU. "
+             "'auto' uses the first hardware encoder that works (default: %(default)s)"
+    )
     parser.add_argument("--out", default=None, help="Output .mp4 filename (single story only, ignored with --all)")
     parser.add_argument("--all", action="store_true", help="Generate videos for every story in the JSON file")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Batch mode: number of videos rendered in parallel, each with its own ffmpeg (default: %(default)s)"
+    )
     parser.add_argument("--list", action="store_true", help="List stories and exit")
     parser.add_argument("--list-voices", action="store_true", help="List available English TTS voices")
     args = parser.parse_args()
@@ -858,14 +1335,19 @@ def main():
     out_dir = Path(VIDEO_OUTPUT_FOLDER)
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    hwaccel = resolve_hwaccel(args.hwaccel)
+    print(f"Encoder : {HW_ENCODERS[hwaccel][0] if hwaccel in HW_ENCODERS else 'libx264'}")
+
     def _make_output(index: int, story: dict) -> str:
         post_id = story.get("id", "unknown")
         safe = "".join(c if c.isalnum() or c in " _-" else "" for c in story["title"])
         safe = safe.strip().replace(" ", "_")[:30]
         return str(out_dir / f"nosleep_{index:02d}_{post_id}_{safe}.mp4")
 
-    def _run(index: int, story: dict, output: str) -> None:
-        create_video(
+    encode_threads = ENCODE_THREADS
+
+    def _video_kwargs(story: dict, output: str) -> dict:
+        return dict(
             story=story,
             output_path=output,
             voice=args.voice,
@@ -879,26 +1361,106 @@ def main():
             tts_rate=args.tts_rate,
             tts_pitch=args.tts_pitch,
             reverb=not args.no_reverb,
+            hwaccel=hwaccel,
+            encode_threads=encode_threads,
         )
 
+    manifest = _load_manifest(out_dir)
+
+    def _fingerprint(story: dict) -> str:
+        # The encoder only changes how a video is compressed, not what it shows
+        settings = _video_kwargs(story, "")
+        for key in ("story", "output_path", "hwaccel", "encode_threads"):
+            del settings[key]
+        return render_fingerprint(story, settings)
+
+    def _is_current(video: Path, story: dict) -> bool:
+        if video.name not in manifest:
+            # Videos rendered before fingerprints were recorded have no entry — adopt
+            # a finished one once; anything else (e.g. a crashed encode) is redone
+            if not _is_finished_mp4(video):
+                return False
+            _record(story, str(video))
+        return manifest[video.name] == _fingerprint(story)
+
+    def _record(story: dict, output: str) -> None:
+        manifest[Path(output).name] = _fingerprint(story)
+        _save_manifest(out_dir, manifest)
+
+    def _run(index: int, story: dict, output: str) -> None:
+        create_video(**_video_kwargs(story, output))
+        _record(story, output)
+
     if args.all or args.index is None:
         print(f"Batch mode: generating {len(stories)} videos...\n")
+        pending = []
         for i, story in enumerate(stories):
             # Match by post ID so re-sorting after a re-scrape doesn't re-render existing videos
             existing = list(out_dir.glob(f"nosleep_*_{story['id']}_*.mp4"))
-            if existing:
+            if existing and _is_current(existing[0], story):
                 print(f"  [{i+1}/{len(stories)}] Skipping (already exists): {existing[0].name}")
                 continue
-            output = _make_output(i, story)
-            print(f"  [{i+1}/{len(stories)}] Starting: {output}")
-            _run(i, story, output)
+            if existing:
+                # Inputs changed since it was rendered, or the encode never finished — redo
+                # it under the same filename so the uploaders' lookups by post ID still find
+                # one file
+                print(f"  [{i+1}/{len(stories)}] Out of date or incomplete, re-rendering: {existing[0].name}")
+                pending.append((i, story, str(existing[0])))
+            else:
+                pending.append((i, story, _make_output(i, story)))
+
+        jobs = max(1, min(args.jobs, len(pending)))
+        if jobs > 1:
+            # Each worker keeps its own font/width caches and ffmpeg process for the
+            # whole batch; the TTS cache is shared safely through atomic renames.
+            print(f"Rendering {len(pending)} videos, {jobs} at a time\n")
+            # Split the cores between the encoders instead of each one sizing
+            # its thread pool for the whole machine
+            encode_threads = max(1, (os.cpu_count() or 1) // jobs)
+            failed = []
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(create_video, **_video_kwargs(story, output)): (story, output)
+                           for i, story, output in pending}
+                try:
+                    for n, future in enumerate(as_completed(futures), 1):
+                        story, output = futures[future]
+                        try:
+                            future.result()
+                        except Exception as exc:  # e.g. TTS gave up after its retries
+                            # Keep going — one bad story shouldn't stall the rest of the batch
+                            failed.append(output)
+                            print(f"  [{n}/{len(pending)}] FAILED: {output} ({exc})")
+                            continue
+                        _record(story, output)
+                        print(f"  [{n}/{len(pending)}] Finished: {output}")
+                except KeyboardInterrupt:
+                    pool.shutdown(wait=False, cancel_futures=True)  # don't start queued stories
+                    raise
+            if failed:
+                sys.exit(f"\nError: {len(failed)} of {len(pending)} videos failed to render.")
+        else:
+            # Synthesise the next story's narration in the background while this one
+            # encodes — TTS is network-bound, encoding is CPU-bound
+            with ThreadPoolExecutor(max_workers=1) as prefetch_pool:
+                next_tts = None
+                for n, (i, story, output) in enumerate(pending):
+                    if next_tts:
+                        next_tts.exception()  # wait for it; a failure is retried (and reported) by create_video
+                    next_tts = None
+                    if not args.no_narration and n + 1 < len(pending):
+                        next_tts = prefetch_pool.submit(
+                            prefetch_narration, pending[n + 1][1], args.voice, args.max_words,
+                            args.tts_rate, args.tts_pitch,
+                        )
+                    print(f"  [{i+1}/{len(stories)}] Starting: {output}")
+                    _run(i, story, output)
         print(f"\nAll done! {len(stories)} videos processed.")
     else:
         if args.index >= len(stories):
             sys.exit(f"Error: index {args.index} out of range ({len(stories)} stories available).")
         story = stories[args.index]
         output = args.out if args.out else _make_output(args.index, story)
-        if Path(output).exists():
+        if Path(output).exists() and _is_current(Path(output), story):
             print(f"Skipping (already exists): {output}")
             return
         _run(args.index, story, output)
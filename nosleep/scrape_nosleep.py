@@ -7,6 +7,9 @@ Default subreddits:
     r/nosleep, r/creepystories, r/scarystories,
     r/DarkTales, r/libraryofshadows, r/Odd_directions, r/TheCrypticCompendium
 
+Requirements:
+    pip install requests
+
 Usage:
     python scrape_nosleep.py                      # comprehensive by default: all-time + hot + new
     python scrape_nosleep.py --quick              # single pass (top/all-time only, faster)
@@ -17,20 +20,28 @@ Usage:
 
 import argparse
 import json
+import os
 import re
 import sys
 import time
-import urllib.request
-import urllib.error
 from pathlib import Path
 
-_last_request_at: float = 0.0   # tracks time of last Reddit request globally
+import requests
+from requests.adapters import HTTPAdapter
+
+_next_request_at: float = 0.0   # earliest time the next Reddit request may start (global)
 
 
 REDDIT_API      = "https://www.reddit.com/r/{subreddit}/{sort}.json?t={time}&limit=100&after={after}"
 HEADERS         = {"User-Agent": "horror-scraper/1.0 (video production script)"}
 MAX_PAGES       = 10   # safety cap — prevents infinite loops (10 pages × 100 posts = 1000 raw posts max)
-MIN_REQUEST_GAP = 6.0  # seconds between any two Reddit requests (~10 req/min unauthenticated limit)
+MIN_REQUEST_GAP = 6.0  # fallback gap when Reddit sends no X-Ratelimit headers (~10 req/min)
+
+# Every request goes to www.reddit.com, so one pooled session keeps the
+# TCP/TLS connection alive instead of re-handshaking on each call.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0))
 
 DEFAULT_SUBREDDITS = [
     "nosleep",
@@ -56,7 +67,7 @@ MIN_WORDS = 50   # stories shorter than this won't make a meaningful video
 
 # ── Discussion-post filter ─────────────────────────────────────────────────────
 # These catch meta/community posts that aren't actual horror stories.
-# Checked against the post title before fetching the body (saves API calls).
+# Checked against the post title and flair before the body is looked at.
 
 # Reddit flairs that reliably indicate non-story content
 DISCUSSION_FLAIRS = {
@@ -125,29 +136,45 @@ def is_discussion_post(post_data: dict) -> bool:
     return any(p.search(title) for p in DISCUSSION_PATTERNS)
 
 
-def fetch_json(url: str, retries: int = 4) -> dict:
+def _schedule_next_request(resp: requests.Response) -> None:
     """
-    Fetch a JSON URL with global rate limiting and exponential backoff on 429s.
-    Enforces MIN_REQUEST_GAP seconds between every request regardless of caller.
+    Pace the next request from Reddit's rate-limit headers: spread the
+    remaining quota evenly over the time left in the window, or wait out the
+    window once the quota is nearly spent. Without headers, fall back to
+    MIN_REQUEST_GAP.
     """
-    global _last_request_at
+    global _next_request_at
+    try:
+        remaining = float(resp.headers["X-Ratelimit-Remaining"])
+        reset     = float(resp.headers["X-Ratelimit-Reset"])
+    except (KeyError, ValueError):
+        gap = MIN_REQUEST_GAP
+    else:
+        gap = reset if remaining < 2 else reset / remaining
+    _next_request_at = time.time() + gap
 
-    # Global rate limiter — sleep if we're requesting too soon
-    elapsed = time.time() - _last_request_at
-    if elapsed < MIN_REQUEST_GAP:
-        time.sleep(MIN_REQUEST_GAP - elapsed)
 
+def fetch_json(url: str, retries: int = 4) -> dict:
+    """
+    Fetch a JSON URL with global rate limiting and exponential backoff on 429s.
+    Every request, regardless of caller, waits for the slot set by the
+    previous response's rate-limit headers.
+    """
     for attempt in range(1, retries + 1):
-        _last_request_at = time.time()
-        req = urllib.request.Request(url, headers=HEADERS)
+        # Global rate limiter — sleep if we're requesting too soon
+        wait = _next_request_at - time.time()
+        if wait > 0:
+            time.sleep(wait)
         try:
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                return json.loads(resp.read().decode())
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
+            resp = SESSION.get(url, timeout=15)
+            _schedule_next_request(resp)
+            resp.raise_for_status()
+            return resp.json()
+        except requests.HTTPError as e:
+            if e.response.status_code == 429:
                 # Exponential backoff: 60s, 120s, 240s, ...
                 # Use Retry-After header if Reddit provides one
-                retry_after = e.headers.get("Retry-After")
+                retry_after = e.response.headers.get("Retry-After")
                 wait = int(retry_after) if retry_after else 60 * (2 ** (attempt - 1))
                 print(f"  Rate limited (429) — waiting {wait}s before retry "
                       f"(attempt {attempt}/{retries})...", file=sys.stderr)
@@ -157,50 +184,73 @@ def fetch_json(url: str, retries: int = 4) -> dict:
     raise RuntimeError(f"Failed after {retries} retries: {url}")
 
 
+_MD_LINK_RE   = re.compile(r'\[([^\]]+)\]\(https?://[^\)]+\)')
+_URL_RE       = re.compile(r'https?://\S+')
+_DBL_SPACE_RE = re.compile(r' {2,}')
+
+
 def clean_body(text: str) -> str:
     """Remove URLs and markdown links from story text."""
     # Replace markdown links [text](url) with just the text
-    text = re.sub(r'\[([^\]]+)\]\(https?://[^\)]+\)', r'\1', text)
+    text = _MD_LINK_RE.sub(r'\1', text)
     # Remove bare URLs
-    text = re.sub(r'https?://\S+', '', text)
+    text = _URL_RE.sub('', text)
     # Clean up any double spaces or trailing whitespace left behind
-    text = re.sub(r' {2,}', ' ', text)
+    text = _DBL_SPACE_RE.sub(' ', text)
     return text.strip()
 
 
-def fetch_story_body(permalink: str) -> str:
-    """Fetch the full selftext for a single post."""
-    url = f"https://www.reddit.com{permalink}.json?limit=1"
-    try:
-        data = fetch_json(url)
-        selftext = data[0]["data"]["children"][0]["data"].get("selftext", "")
-        # "[removed]" or "[deleted]" means content is gone
-        if selftext in ("[removed]", "[deleted]", ""):
-            return ""
-        return clean_body(selftext)
-    except Exception as exc:
-        print(f"  Warning: could not fetch body ({exc})", file=sys.stderr)
+def story_body(selftext: str) -> str:
+    """Clean a post's selftext, returning "" if the content is gone."""
+    # "[removed]" or "[deleted]" means content is gone
+    if selftext in ("[removed]", "[deleted]", ""):
         return ""
+    return clean_body(selftext)
+
+
+def fetch_story_bodies(post_ids: list[str]) -> dict[str, str]:
+    """
+    Fetch selftext for posts the listing returned without one, batching up to
+    100 IDs per /api/info request. Returns {post_id: cleaned body}.
+    """
+    bodies: dict[str, str] = {}
+    for i in range(0, len(post_ids), 100):
+        ids = ",".join(f"t3_{pid}" for pid in post_ids[i:i + 100])
+        try:
+            data = fetch_json(f"https://www.reddit.com/api/info.json?id={ids}")
+        except Exception as exc:
+            print(f"  Warning: could not fetch bodies ({exc})", file=sys.stderr)
+            continue
+        for child in data["data"]["children"]:
+            d = child["data"]
+            bodies[d["id"]] = story_body(d.get("selftext", ""))
+    return bodies
 
 
 def scrape_subreddit(subreddit: str, sort: str = "top",
-                     time_filter: str = "month", target: int = 100) -> list[dict]:
+                     time_filter: str = "month", target: int = 100,
+                     seen_ids: set[str] | None = None) -> list[dict]:
     """
     Fetch qualifying posts from a single subreddit, paginating until `target`
     qualifying stories are collected or Reddit has no more posts to return.
     A qualifying story is a self-post with a body between MIN_WORDS and 1000 words.
+    Posts already in `seen_ids` count toward `target` but are skipped without
+    any body work and not returned; accepted posts are added to `seen_ids`.
     """
+    if seen_ids is None:
+        seen_ids = set()
     print(f"\n── r/{subreddit} ──────────────────────────────────────", file=sys.stderr)
 
     stories: list[dict] = []
+    collected = 0    # qualifying posts seen this call, including already-known ones
     after = ""       # Reddit pagination cursor (empty = first page)
     page  = 0
 
-    while len(stories) < target and page < MAX_PAGES:
+    while collected < target and page < MAX_PAGES:
         page += 1
         url = REDDIT_API.format(subreddit=subreddit, sort=sort,
                                 time=time_filter, after=after)
-        print(f"  Page {page} — {len(stories)}/{target} qualifying so far — {url}",
+        print(f"  Page {page} — {collected}/{target} qualifying so far — {url}",
               file=sys.stderr)
 
         try:
@@ -216,48 +266,70 @@ def scrape_subreddit(subreddit: str, sort: str = "top",
             print(f"  No more posts available.", file=sys.stderr)
             break
 
+        # The listing already carries each post's selftext; only posts that
+        # came back with an empty selftext but rendered HTML need a refetch.
+        candidates = []
         for post in posts:
-            if len(stories) >= target:
-                break
-
             d = post["data"]
 
             # Skip non-text posts
             if not d.get("is_self", False):
                 continue
 
-            title = d["title"]
+            # Already stored by an earlier pass or run — it qualified then
+            if d["id"] in seen_ids:
+                candidates.append(d)
+                continue
 
-            # Skip meta/discussion/community posts before hitting the API again
+            # Skip meta/discussion/community posts before looking at the body
             if is_discussion_post(d):
-                print(f"  Skipping '{title[:60]}' (discussion/meta)", file=sys.stderr)
+                print(f"  Skipping '{d['title'][:60]}' (discussion/meta)", file=sys.stderr)
+                continue
+
+            candidates.append(d)
+
+        refetched = fetch_story_bodies([d["id"] for d in candidates
+                                        if d["id"] not in seen_ids
+                                        and not d.get("selftext") and d.get("selftext_html")])
+
+        for d in candidates:
+            if collected >= target:
+                break
+
+            pid = d["id"]
+            if pid in seen_ids:
+                collected += 1
                 continue
 
-            body  = fetch_story_body(d["permalink"])
+            title     = d["title"]
+            permalink = d["permalink"]
+            body      = refetched.get(pid) or story_body(d.get("selftext", ""))
 
             if not body:
                 print(f"  Skipping '{title[:50]}' (no body)", file=sys.stderr)
                 continue
 
-            words = body.split()
-            if len(words) < MIN_WORDS:
+            word_count = len(body.split())
+            if word_count < MIN_WORDS:
                 print(f"  Skipping '{title[:50]}' (<{MIN_WORDS} words)", file=sys.stderr)
                 continue
-            if len(words) > 1000:
+            if word_count > 1000:
                 print(f"  Skipping '{title[:50]}' (>{1000} words)", file=sys.stderr)
                 continue
 
-            print(f"  ✓ [{len(stories)+1}/{target}] {title[:60]}", file=sys.stderr)
+            collected += 1
+            seen_ids.add(pid)
+            print(f"  ✓ [{collected}/{target}] {title[:60]}", file=sys.stderr)
             stories.append({
-                "id":           d["id"],
+                "id":           pid,
                 "subreddit":    subreddit,
                 "title":        title,
                 "author":       d["author"],
                 "score":        d["score"],
-                "url":          f"https://www.reddit.com{d['permalink']}",
+                "url":          f"https://www.reddit.com{permalink}",
                 "created_utc":  d["created_utc"],
                 "num_comments": d["num_comments"],
-                "word_count":   len(words),
+                "word_count":   word_count,
                 "body":         body,
             })
 
@@ -267,32 +339,29 @@ def scrape_subreddit(subreddit: str, sort: str = "top",
 
         # rate limiter in fetch_json handles pacing between pages
 
-    print(f"  Collected {len(stories)} qualifying stories from r/{subreddit}",
+    print(f"  Collected {collected} qualifying stories from r/{subreddit} "
+          f"({len(stories)} new)",
           file=sys.stderr)
     return stories
 
 
 def scrape_all(subreddits: list[str], sort: str = "top",
-               time_filter: str = "month", target: int = 100) -> list[dict]:
+               time_filter: str = "month", target: int = 100,
+               seen_ids: set[str] | None = None) -> list[dict]:
     """
     Scrape multiple subreddits, deduplicate by post ID, and sort by score descending.
     `target` is the number of qualifying stories to collect per subreddit.
-    Adds a 2-second pause between subreddits to be polite to Reddit's API.
+    Only stories whose ID is not in `seen_ids` are returned; the set is updated
+    in place so it can be shared across passes.
+    Pacing between subreddits is left to the global rate limiter in fetch_json.
     """
-    seen_ids: set[str] = set()
+    if seen_ids is None:
+        seen_ids = set()
     all_stories: list[dict] = []
 
-    for i, subreddit in enumerate(subreddits):
-        stories = scrape_subreddit(subreddit, sort=sort, time_filter=time_filter, target=target)
-        for story in stories:
-            if story["id"] not in seen_ids:
-                seen_ids.add(story["id"])
-                all_stories.append(story)
-
-        # Pause between subreddits (skip after the last one)
-        if i < len(subreddits) - 1:
-            print(f"\n  Pausing 10s before next subreddit...", file=sys.stderr)
-            time.sleep(10)
+    for subreddit in subreddits:
+        all_stories += scrape_subreddit(subreddit, sort=sort, time_filter=time_filter,
+                                        target=target, seen_ids=seen_ids)
 
     # Sort combined results by score, highest first
     all_stories.sort(key=lambda s: s["score"], reverse=True)
@@ -301,6 +370,8 @@ def scrape_all(subreddits: list[str], sort: str = "top",
 
 
 VIDEO_OUTPUT_FOLDER = "video_output"
+# post IDs are lowercase alphanumeric, typically 5-8 chars
+_VIDEO_NAME_RE = re.compile(r"^nosleep_\d+_([a-z0-9]+)_.*\.mp4$")
 
 
 def _existing_video_ids(video_folder: str) -> set[str]:
@@ -310,16 +381,16 @@ def _existing_video_ids(video_folder: str) -> set[str]:
     Expected pattern: nosleep_NN_<post_id>_<safe_title>.mp4
     The post_id is the alphanumeric Reddit identifier (e.g. '1qzmmkg').
     """
-    folder = Path(video_folder)
-    if not folder.is_dir():
+    if not os.path.isdir(video_folder):
         return set()
-    # post IDs are lowercase alphanumeric, typically 5-8 chars
-    pattern = re.compile(r"^nosleep_\d+_([a-z0-9]+)_.*\.mp4$")
     ids: set[str] = set()
-    for f in folder.iterdir():
-        m = pattern.match(f.name)
-        if m:
-            ids.add(m.group(1))
+    with os.scandir(video_folder) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".mp4"):
+                continue
+            m = _VIDEO_NAME_RE.match(entry.name)
+            if m:
+                ids.add(m.group(1))
     return ids
 
 
@@ -363,17 +434,16 @@ def main():
         print(f"Pass: {label} — {len(args.subreddits)} subreddit(s)", file=sys.stderr)
         print(f"{'='*60}", file=sys.stderr)
 
-        fresh = scrape_all(
+        # existing_ids is shared with the scraper, so everything returned is new
+        new_stories = scrape_all(
             subreddits=args.subreddits,
             sort=sort,
             time_filter=time_filter,
             target=args.limit,
+            seen_ids=existing_ids,
         )
 
-        new_stories = [s for s in fresh if s["id"] not in existing_ids]
-        for s in new_stories:
-            existing_ids.add(s["id"])
-            existing_stories.append(s)
+        existing_stories += new_stories
         total_new += len(new_stories)
         print(f"\n  {len(new_stories)} new stories from pass [{label}]", file=sys.stderr)
 
@@ -385,10 +455,11 @@ def main():
     else:
         print(f"\nNo new stories found — '{args.out}' is up to date.", file=sys.stderr)
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(existing_stories, f, ensure_ascii=False, indent=2)
-
-    print(f"\nSaved {len(existing_stories)} stories total to {args.out}", file=sys.stderr)
+    # Nothing merged means the file on disk already holds this exact list
+    if total_new or not Path(args.out).exists():
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(existing_stories, f, ensure_ascii=False, indent=2)
+        print(f"\nSaved {len(existing_stories)} stories total to {args.out}", file=sys.stderr)
 
     # Print a quick summary table to stdout
     print(f"\n{'#':<4} {'Score':<7} {'Words':<7} {'Subreddit':<18} Title")
@@ -396,6 +467,8 @@ def main():
     for i, s in enumerate(existing_stories, 1):
         print(f"{i:<4} {s['score']:<7} {s['word_count']:<7} {s['subreddit']:<18} {s['title'][:40]}")
 
+    SESSION.close()
+
 
 if __name__ == "__main__":
     main()
@@ -19,6 +19,9 @@ Usage:
 import argparse
 import http.server
 import json
+import mmap
+import os
+import random
 import re
 import subprocess
 import sys
@@ -30,6 +33,8 @@ from urllib.parse import urlencode, parse_qs, urlparse
 
 import imageio_ffmpeg
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 
@@ -38,6 +43,7 @@ VIDEO_OUTPUT_DIR = "video_output"
 UPLOADED_FILE    = "uploaded_instagram.json"
 CREDS_FILE       = "instagram_creds.json"
 TOKEN_FILE       = "instagram_token.json"
+USER_CACHE_FILE  = "instagram_user_cache.json"
 
 GRAPH_BASE   = "https://graph.facebook.com/v21.0"
 AUTH_URL     = "https://www.facebook.com/v21.0/dialog/oauth"
@@ -47,11 +53,26 @@ REDIRECT_URI = "http://localhost:8080/callback"
 # Permissions needed for content publishing
 SCOPES = "instagram_basic,instagram_content_publish,pages_show_list,pages_read_engagement"
 
+TOKEN_CHECK_INTERVAL = 3600  # seconds between /debug_token checks of a saved token
+
 MAX_REEL_DURATION  = 60   # empirical safe limit for Reels via the Content Publishing API
 MAX_REEL_SIZE_MB   = 7.5  # empirical safe file size limit (dev mode appears to cap at ~8 MB)
 
 CHUNK_SIZE = 5 * 1024 * 1024  # 5 MB per chunk
 
+# One pooled session for every API call, so the token, init, upload and status
+# requests to graph.facebook.com reuse a connection instead of re-handshaking.
+# Only idempotent methods are retried on gateway errors (urllib3's default).
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      raise_on_status=False),
+))
+
+POLL_TIMEOUT   = 150  # seconds to wait for processing before giving up
+POLL_MAX_DELAY = 15   # cap on the backed-off delay between status polls
+
 # ── Credentials ───────────────────────────────────────────────────────────────
 
 def load_creds() -> dict:
@@ -86,6 +107,16 @@ def _capture_callback() -> str:
     return result["path"]
 
 
+def _write_json(path: str, data, **dump_kwargs) -> None:
+    """Write JSON atomically: a crash mid-write leaves the previous file intact."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, **dump_kwargs)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
 def load_token() -> dict | None:
     if Path(TOKEN_FILE).exists():
         with open(TOKEN_FILE, encoding="utf-8") as fh:
@@ -94,13 +125,12 @@ def load_token() -> dict | None:
 
 
 def save_token(token: dict) -> None:
-    with open(TOKEN_FILE, "w", encoding="utf-8") as fh:
-        json.dump(token, fh, indent=2)
+    _write_json(TOKEN_FILE, token, indent=2)
 
 
 def _exchange_for_long_lived(creds: dict, short_token: str) -> dict:
     """Exchange a short-lived token for a long-lived one (valid ~60 days)."""
-    resp = requests.get(TOKEN_URL, params={
+    resp = SESSION.get(TOKEN_URL, params={
         "grant_type":        "fb_exchange_token",
         "client_id":         creds["app_id"],
         "client_secret":     creds["app_secret"],
@@ -114,16 +144,66 @@ def _exchange_for_long_lived(creds: dict, short_token: str) -> dict:
 
 def _refresh_token(creds: dict, token: dict) -> dict:
     """Refresh a long-lived token before it expires."""
-    return _exchange_for_long_lived(creds, token["access_token"])
+    new_token = _exchange_for_long_lived(creds, token["access_token"])
+    # The exchange response only carries the token; keep the resolved account
+    if token.get("ig_user_id"):
+        new_token["ig_user_id"] = token["ig_user_id"]
+    return new_token
+
+
+def _token_is_valid(creds: dict, access_token: str) -> bool:
+    """
+    Ask /debug_token whether a saved token still works — it can be revoked
+    long before it expires. Treats an unreachable endpoint as valid so a
+    transient error doesn't force a browser login.
+    """
+    try:
+        resp = SESSION.get(f"{GRAPH_BASE}/debug_token", params={
+            "input_token":  access_token,
+            "access_token": f"{creds['app_id']}|{creds['app_secret']}",
+        })
+        if not resp.ok:
+            return True
+        return bool(resp.json().get("data", {}).get("is_valid"))
+    except (requests.RequestException, ValueError):
+        return True
+
+
+def _load_user_cache() -> dict:
+    if Path(USER_CACHE_FILE).exists():
+        with open(USER_CACHE_FILE, encoding="utf-8") as fh:
+            return json.load(fh)
+    return {}
+
+
+def forget_ig_user_id() -> None:
+    """Drop the cached Instagram User ID so the next run resolves it again."""
+    app_id = load_creds()["app_id"]
+    cache  = _load_user_cache()
+    if cache.pop(app_id, None) is not None:
+        _write_json(USER_CACHE_FILE, cache, indent=2)
+    token = load_token()
+    if token and token.pop("ig_user_id", None) is not None:
+        save_token(token)
 
 
 def _find_ig_user_id(access_token: str, creds: dict) -> str:
-    """Get the Instagram Business Account ID, using ig_user_id from creds if set."""
+    """
+    Get the Instagram Business Account ID, using ig_user_id from creds if set.
+    Otherwise walks the user's Pages (one request per Page) and caches the
+    result per app_id, so re-auths don't repeat the walk.
+    """
     if creds.get("ig_user_id"):
         print(f"  Using Instagram User ID from credentials: {creds['ig_user_id']}")
         return creds["ig_user_id"]
 
-    pages_resp = requests.get(f"{GRAPH_BASE}/me/accounts", params={
+    cache  = _load_user_cache()
+    cached = cache.get(creds["app_id"])
+    if cached:
+        print(f"  Using cached Instagram User ID: {cached['ig_user_id']}")
+        return cached["ig_user_id"]
+
+    pages_resp = SESSION.get(f"{GRAPH_BASE}/me/accounts", params={
         "access_token": access_token,
         "fields":       "id,name",
     })
@@ -131,7 +211,7 @@ def _find_ig_user_id(access_token: str, creds: dict) -> str:
     pages = pages_resp.json().get("data", [])
 
     for page in pages:
-        ig_resp = requests.get(f"{GRAPH_BASE}/{page['id']}", params={
+        ig_resp = SESSION.get(f"{GRAPH_BASE}/{page['id']}", params={
             "fields":       "instagram_business_account",
             "access_token": access_token,
         })
@@ -139,6 +219,11 @@ def _find_ig_user_id(access_token: str, creds: dict) -> str:
         ig_data = ig_resp.json().get("instagram_business_account")
         if ig_data:
             print(f"  Found Instagram account (ID: {ig_data['id']}) via Page: {page['name']}")
+            cache[creds["app_id"]] = {
+                "ig_user_id":  ig_data["id"],
+                "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            _write_json(USER_CACHE_FILE, cache, indent=2)
             return ig_data["id"]
 
     raise RuntimeError(
@@ -152,7 +237,8 @@ def get_access_token() -> tuple[str, str]:
     """
     Return a valid (access_token, ig_user_id) pair.
     Refreshes the token automatically if it's close to expiring.
-    Opens a browser for the full OAuth flow if no token exists.
+    Opens a browser for the full OAuth flow if no token exists or the saved
+    one has been revoked.
     """
     creds = load_creds()
     token = load_token()
@@ -164,6 +250,18 @@ def get_access_token() -> tuple[str, str]:
             print("Refreshing Instagram access token...")
             token = _refresh_token(creds, token)
             save_token(token)
+        elif time.time() - token.get("_debug_checked_at", 0) > TOKEN_CHECK_INTERVAL:
+            if _token_is_valid(creds, token["access_token"]):
+                token["_debug_checked_at"] = time.time()
+                save_token(token)
+            else:
+                print("Saved Instagram token has been revoked — re-authenticating...")
+                token = None
+
+    if token:
+        if not token.get("ig_user_id"):
+            token["ig_user_id"] = _find_ig_user_id(token["access_token"], creds)
+            save_token(token)
         return token["access_token"], token["ig_user_id"]
 
     # Full OAuth flow
@@ -181,7 +279,7 @@ def get_access_token() -> tuple[str, str]:
     code = qs["code"][0]
 
     # Exchange code for short-lived token
-    short_resp = requests.get(TOKEN_URL, params={
+    short_resp = SESSION.get(TOKEN_URL, params={
         "client_id":     creds["app_id"],
         "client_secret": creds["app_secret"],
         "redirect_uri":  REDIRECT_URI,
@@ -210,8 +308,7 @@ def load_uploaded() -> dict:
 
 
 def save_uploaded(uploaded: dict) -> None:
-    with open(UPLOADED_FILE, "w", encoding="utf-8") as fh:
-        json.dump(uploaded, fh, indent=2, ensure_ascii=False)
+    _write_json(UPLOADED_FILE, uploaded, indent=2, ensure_ascii=False)
 
 # ── Metadata ───────────────────────────────────────────────────────────────────
 
@@ -255,7 +352,7 @@ def _upload_video_inner(access_token: str, ig_user_id: str, video_path: str, sto
     size = Path(video_path).stat().st_size
 
     # Step 1: Create a media container
-    container_resp = requests.post(
+    container_resp = SESSION.post(
         f"{GRAPH_BASE}/{ig_user_id}/media",
         data={
             "media_type":   "REELS",
@@ -265,6 +362,9 @@ def _upload_video_inner(access_token: str, ig_user_id: str, video_path: str, sto
         },
     )
     if not container_resp.ok:
+        if container_resp.status_code in (400, 403):
+            # Possibly a stale account ID — resolve it afresh next run
+            forget_ig_user_id()
         sys.exit(f"ERROR {container_resp.status_code}: {container_resp.text}")
     container_data = container_resp.json()
     container_id   = container_data["id"]
@@ -273,21 +373,25 @@ def _upload_video_inner(access_token: str, ig_user_id: str, video_path: str, sto
     # Step 2: Upload the video file in chunks
     print(f"  Uploading: {Path(video_path).name}")
     chunk_count = (size + CHUNK_SIZE - 1) // CHUNK_SIZE
-    with open(video_path, "rb") as fh:
+    # Chunks are zero-copy slices of the memory-mapped file rather than
+    # fresh CHUNK_SIZE bytes objects read onto the heap
+    with open(video_path, "rb") as fh, \
+         mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+         memoryview(mm) as view:
         for i in range(chunk_count):
-            chunk  = fh.read(CHUNK_SIZE)
             offset = i * CHUNK_SIZE
-            resp   = requests.post(
-                upload_uri,
-                data=chunk,
-                params={"access_token": access_token},
-                headers={
-                    "Content-Type":   "video/mp4",
-                    "Content-Length": str(len(chunk)),
-                    "file_size":      str(size),
-                    "offset":         str(offset),
-                },
-            )
+            with view[offset:offset + CHUNK_SIZE] as chunk:
+                resp = SESSION.post(
+                    upload_uri,
+                    data=chunk,
+                    params={"access_token": access_token},
+                    headers={
+                        "Content-Type":   "video/mp4",
+                        "Content-Length": str(len(chunk)),
+                        "file_size":      str(size),
+                        "offset":         str(offset),
+                    },
+                )
             if not resp.ok:
                 sys.exit(f"ERROR {resp.status_code} on chunk {i}: {resp.text}")
             pct = int((i + 1) / chunk_count * 100)
@@ -297,9 +401,14 @@ def _upload_video_inner(access_token: str, ig_user_id: str, video_path: str, sto
     # Step 3: Poll until Instagram finishes processing the video
     print("  Processing...", end="\r")
     status_code = "IN_PROGRESS"
-    for _ in range(30):
-        time.sleep(5)
-        status_resp = requests.get(
+    delay    = 1.0
+    deadline = time.time() + POLL_TIMEOUT
+    while time.time() < deadline:
+        # Short videos finish in a few seconds, so start polling fast and
+        # back off (with jitter) for the ones that take longer
+        time.sleep(delay + random.uniform(0, 0.5 * delay))
+        delay = min(delay * 1.7, POLL_MAX_DELAY)
+        status_resp = SESSION.get(
             f"{GRAPH_BASE}/{container_id}",
             params={"fields": "status_code", "access_token": access_token},
         )
@@ -313,7 +422,7 @@ def _upload_video_inner(access_token: str, ig_user_id: str, video_path: str, sto
         raise RuntimeError(f"Instagram video processing failed: {status_code}")
 
     # Step 4: Publish the container as a Reel
-    publish_resp = requests.post(
+    publish_resp = SESSION.post(
         f"{GRAPH_BASE}/{ig_user_id}/media_publish",
         data={
             "creation_id":  container_id,
@@ -336,10 +445,23 @@ def get_video_duration(video_path: str) -> float:
     return 0.0
 
 
-def find_video_for_story(story_id: str, video_dir: Path) -> Path | None:
-    for path in video_dir.glob(f"nosleep_*_{story_id}_*.mp4"):
-        return path
-    return None
+def index_videos(video_dir: Path) -> dict[str, Path]:
+    """
+    Map story ID -> rendered video with a single directory scan.
+    Expected pattern: nosleep_NN_<post_id>_<safe_title>.mp4
+    """
+    index: dict[str, Path] = {}
+    if not video_dir.is_dir():
+        return index
+    with os.scandir(video_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith("nosleep_") or not name.endswith(".mp4"):
+                continue
+            parts = name.split("_", 3)
+            if len(parts) == 4:
+                index.setdefault(parts[2], Path(entry.path))
+    return index
 
 # ── Main ───────────────────────────────────────────────────────────────────────
 
@@ -357,8 +479,8 @@ def main():
     with open(STORIES_FILE, encoding="utf-8") as fh:
         stories = json.load(fh)
 
-    video_dir = Path(VIDEO_OUTPUT_DIR)
-    uploaded  = load_uploaded()
+    videos   = index_videos(Path(VIDEO_OUTPUT_DIR))
+    uploaded = load_uploaded()
 
     pending = []
     skipped_long = 0
@@ -366,7 +488,7 @@ def main():
         sid = story["id"]
         if sid in uploaded:
             continue
-        video_path = find_video_for_story(sid, video_dir)
+        video_path = videos.get(sid)
         if video_path is None:
             continue
         duration = get_video_duration(str(video_path))
@@ -375,6 +497,10 @@ def main():
             skipped_long += 1
             continue
         pending.append((story, video_path))
+        # Only one video goes up per run, so stop probing durations once it's
+        # found; a dry run keeps scanning to report the full backlog
+        if not args.dry_run:
+            break
 
     if skipped_long:
         print(f"Skipped {skipped_long} video(s) exceeding {MAX_REEL_DURATION}s or {MAX_REEL_SIZE_MB}MB (not eligible for Reels via API).\n")
@@ -384,14 +510,15 @@ def main():
         return
 
     story, video_path = pending[0]
-    print(f"Found {len(pending)} pending video(s).  Uploading next: {story['title']}\n")
 
     if args.dry_run:
+        print(f"Found {len(pending)} pending video(s).  Uploading next: {story['title']}\n")
         print("DRY RUN — no upload will be made.")
         print(f"  [{story['id']}] {story['title']}")
         print(f"  File: {video_path.name}")
         return
 
+    print(f"Uploading next pending video: {story['title']}\n")
     access_token, ig_user_id = get_access_token()
 
     try:
@@ -13,6 +13,7 @@ Prerequisites:
 Usage:
     python upload_tiktok.py              # upload pending videos (up to --limit)
     python upload_tiktok.py --limit 3    # upload at most 3 videos this run
+    python upload_tiktok.py --limit 3 --concurrency 2   # two uploads in flight at once
     python upload_tiktok.py --dry-run    # preview without uploading
     python upload_tiktok.py --privacy PUBLIC_TO_EVERYONE
 """
@@ -21,14 +22,20 @@ import argparse
 import base64
 import hashlib
 import json
+import mmap
+import os
+import random
 import secrets
 import sys
 import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urlencode, parse_qs, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 
@@ -50,9 +57,28 @@ SCOPES       = "video.upload"
 DEFAULT_PRIVACY = "SELF_ONLY"
 DEFAULT_LIMIT   = 3
 DEFAULT_DELAY   = 10
+DEFAULT_CONCURRENCY = 1
 
 CHUNK_SIZE = 10 * 1024 * 1024  # 10 MB per chunk
 
+# One pooled session for every API call, so the token, init, upload and status
+# requests to open.tiktokapis.com reuse a connection instead of re-handshaking.
+# Only idempotent methods are retried on gateway errors (urllib3's default).
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      raise_on_status=False),
+))
+
+POLL_TIMEOUT   = 150  # seconds to wait for processing before giving up
+POLL_MAX_DELAY = 15   # cap on the backed-off delay between status polls
+
+# Final states of /status/fetch. Inbox (draft) uploads end at
+# SEND_TO_USER_INBOX and never reach PUBLISH_COMPLETE.
+FINAL_STATUSES  = ("SEND_TO_USER_INBOX", "PUBLISH_COMPLETE", "FAILED", "PUBLISH_FAILED")
+FAILED_STATUSES = ("FAILED", "PUBLISH_FAILED")
+
 # ── Credentials ───────────────────────────────────────────────────────────────
 
 def load_creds() -> dict:
@@ -83,6 +109,16 @@ def _capture_callback() -> str:
     return f"/?code={code}"
 
 
+def _write_json(path: str, data, **dump_kwargs) -> None:
+    """Write JSON atomically: a crash mid-write leaves the previous file intact."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, **dump_kwargs)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
 def load_token() -> dict | None:
     if Path(TOKEN_FILE).exists():
         with open(TOKEN_FILE, encoding="utf-8") as fh:
@@ -91,12 +127,11 @@ def load_token() -> dict | None:
 
 
 def save_token(token: dict) -> None:
-    with open(TOKEN_FILE, "w", encoding="utf-8") as fh:
-        json.dump(token, fh, indent=2)
+    _write_json(TOKEN_FILE, token, indent=2)
 
 
 def _refresh_token(creds: dict, token: dict) -> dict:
-    resp = requests.post(TOKEN_URL, data={
+    resp = SESSION.post(TOKEN_URL, data={
         "client_key":    creds["client_key"],
         "client_secret": creds["client_secret"],
         "grant_type":    "refresh_token",
@@ -141,7 +176,7 @@ def get_access_token() -> str:
     qs   = parse_qs(urlparse(callback_path).query)
     code = qs["code"][0]
 
-    resp = requests.post(TOKEN_URL, data={
+    resp = SESSION.post(TOKEN_URL, data={
         "client_key":    creds["client_key"],
         "client_secret": creds["client_secret"],
         "code":          code,
@@ -165,8 +200,7 @@ def load_uploaded() -> dict:
 
 
 def save_uploaded(uploaded: dict) -> None:
-    with open(UPLOADED_FILE, "w", encoding="utf-8") as fh:
-        json.dump(uploaded, fh, indent=2, ensure_ascii=False)
+    _write_json(UPLOADED_FILE, uploaded, indent=2, ensure_ascii=False)
 
 # ── Metadata ───────────────────────────────────────────────────────────────────
 
@@ -192,7 +226,7 @@ def upload_video(access_token: str, video_path: str, story: dict, privacy: str)
     }
 
     # Step 1: Initialise the post
-    init_resp = requests.post(POST_INIT_URL, headers=headers, json={
+    init_resp = SESSION.post(POST_INIT_URL, headers=headers, json={
         "source_info": {
             "source":            "FILE_UPLOAD",
             "video_size":        size,
@@ -208,20 +242,24 @@ def upload_video(access_token: str, video_path: str, story: dict, privacy: str)
 
     # Step 2: Upload in chunks
     print(f"  Uploading: {Path(video_path).name}")
-    with open(video_path, "rb") as fh:
+    # Chunks are zero-copy slices of the memory-mapped file, so even a
+    # single-chunk upload never holds the whole video on the heap
+    with open(video_path, "rb") as fh, \
+         mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+         memoryview(mm) as view:
         for i in range(chunk_count):
-            chunk = fh.read(chunk_size)
             start = i * chunk_size
-            end   = start + len(chunk) - 1
-            resp  = requests.put(
-                upload_url,
-                data=chunk,
-                headers={
-                    "Content-Type":   "video/mp4",
-                    "Content-Range":  f"bytes {start}-{end}/{size}",
-                    "Content-Length": str(len(chunk)),
-                },
-            )
+            with view[start:start + chunk_size] as chunk:
+                end  = start + len(chunk) - 1
+                resp = SESSION.put(
+                    upload_url,
+                    data=chunk,
+                    headers={
+                        "Content-Type":   "video/mp4",
+                        "Content-Range":  f"bytes {start}-{end}/{size}",
+                        "Content-Length": str(len(chunk)),
+                    },
+                )
             resp.raise_for_status()
             pct = int((i + 1) / chunk_count * 100)
             print(f"    {pct}% ...", end="\r")
@@ -229,29 +267,48 @@ def upload_video(access_token: str, video_path: str, story: dict, privacy: str)
 
     # Step 3: Poll until processing finishes
     print("  Processing...", end="\r")
-    for _ in range(30):
-        time.sleep(5)
-        status_resp = requests.post(
+    status   = "PROCESSING"
+    delay    = 1.0
+    deadline = time.time() + POLL_TIMEOUT
+    while time.time() < deadline:
+        # Short videos finish in a few seconds, so start polling fast and
+        # back off (with jitter) for the ones that take longer
+        time.sleep(delay + random.uniform(0, 0.5 * delay))
+        delay = min(delay * 1.7, POLL_MAX_DELAY)
+        status_resp = SESSION.post(
             STATUS_URL,
             headers=headers,
             json={"publish_id": publish_id},
         )
         status = status_resp.json().get("data", {}).get("status", "PROCESSING")
-        if status in ("PUBLISH_COMPLETE", "PUBLISH_FAILED"):
+        if status in FINAL_STATUSES:
             break
     print(f"  Status: {status}          ")
 
-    if status == "PUBLISH_FAILED":
+    if status in FAILED_STATUSES:
         raise RuntimeError(f"TikTok publish failed for publish_id={publish_id}")
 
     return publish_id
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
-def find_video_for_story(story_id: str, video_dir: Path) -> Path | None:
-    for path in video_dir.glob(f"nosleep_*_{story_id}_*.mp4"):
-        return path
-    return None
+def index_videos(video_dir: Path) -> dict[str, Path]:
+    """
+    Map story ID -> rendered video with a single directory scan.
+    Expected pattern: nosleep_NN_<post_id>_<safe_title>.mp4
+    """
+    index: dict[str, Path] = {}
+    if not video_dir.is_dir():
+        return index
+    with os.scandir(video_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith("nosleep_") or not name.endswith(".mp4"):
+                continue
+            parts = name.split("_", 3)
+            if len(parts) == 4:
+                index.setdefault(parts[2], Path(entry.path))
+    return index
 
 # ── Main ───────────────────────────────────────────────────────────────────────
 
@@ -263,7 +320,9 @@ def main():
     parser.add_argument("--limit",   type=int, default=DEFAULT_LIMIT,
                         help="Maximum number of videos to upload per run.")
     parser.add_argument("--delay",   type=int, default=DEFAULT_DELAY,
-                        help="Seconds to wait between uploads.")
+                        help="Seconds to wait between uploads (between starts with --concurrency > 1).")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Number of videos to upload at once.")
     parser.add_argument("--privacy", default=DEFAULT_PRIVACY,
                         choices=["SELF_ONLY", "FOLLOWER_OF_CREATOR",
                                  "MUTUAL_FOLLOW_FRIENDS", "PUBLIC_TO_EVERYONE"],
@@ -277,27 +336,30 @@ def main():
     with open(STORIES_FILE, encoding="utf-8") as fh:
         stories = json.load(fh)
 
-    video_dir = Path(VIDEO_OUTPUT_DIR)
-    uploaded  = load_uploaded()
+    videos   = index_videos(Path(VIDEO_OUTPUT_DIR))
+    uploaded = load_uploaded()
 
     pending = []
     for story in stories:
         sid = story["id"]
         if sid in uploaded:
             continue
-        video_path = find_video_for_story(sid, video_dir)
+        video_path = videos.get(sid)
         if video_path is None:
             continue
         pending.append((story, video_path))
+        # A dry run keeps scanning to report the full backlog
+        if len(pending) >= args.limit and not args.dry_run:
+            break
 
     if not pending:
         print("Nothing to upload — all rendered videos have already been uploaded to TikTok.")
         return
 
     to_upload = pending[:args.limit]
-    print(f"Found {len(pending)} pending video(s).  Uploading {len(to_upload)} (limit: {args.limit}).\n")
 
     if args.dry_run:
+        print(f"Found {len(pending)} pending video(s).  Uploading {len(to_upload)} (limit: {args.limit}).\n")
         print("DRY RUN — no uploads will be made.\n")
         for story, path in to_upload:
             print(f"  [{story['id']}] {story['title']}")
@@ -305,16 +367,10 @@ def main():
             print(f"         Privacy: {args.privacy}\n")
         return
 
+    print(f"Uploading {len(to_upload)} pending video(s) (limit: {args.limit}).\n")
     access_token = get_access_token()
 
-    for i, (story, video_path) in enumerate(to_upload):
-        print(f"\n[{i + 1}/{len(to_upload)}] {story['title']}")
-        try:
-            publish_id = upload_video(access_token, str(video_path), story, args.privacy)
-        except (requests.HTTPError, RuntimeError) as exc:
-            print(f"  ERROR: {exc}")
-            break
-
+    def record(story: dict, publish_id: str) -> None:
         uploaded[story["id"]] = {
             "tiktok_publish_id": publish_id,
             "title":             story["title"],
@@ -324,9 +380,59 @@ def main():
         save_uploaded(uploaded)
         print(f"  Done (publish_id: {publish_id})")
 
-        if i < len(to_upload) - 1:
-            print(f"  Waiting {args.delay}s before next upload...")
-            time.sleep(args.delay)
+    if args.concurrency > 1:
+        # Uploads are independent, so run several at once. Starts are still
+        # staggered by --delay; results are recorded here on the main thread
+        # as each one finishes, so a crash never loses a completed upload.
+        futures = {}
+
+        def reap(future) -> None:
+            story = futures.pop(future)
+            if future.cancelled():
+                return
+            try:
+                publish_id = future.result()
+            except Exception as exc:  # HTTP/network error, bad status JSON, ...
+                print(f"  ERROR [{story['id']}]: {exc}")
+                return
+            record(story, publish_id)
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            try:
+                for i, (story, video_path) in enumerate(to_upload):
+                    if i:
+                        time.sleep(args.delay)
+                    for future in [f for f in futures if f.done()]:
+                        reap(future)
+                    print(f"\n[{i + 1}/{len(to_upload)}] {story['title']}")
+                    future = pool.submit(upload_video, access_token, str(video_path),
+                                         story, args.privacy)
+                    futures[future] = story
+                for future in as_completed(list(futures)):
+                    reap(future)
+            except KeyboardInterrupt:
+                print("\nInterrupted \u2014 finishing uploads already in progress...")
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                # Uploads already sent still get published, so wait for them
+                # and record them rather than re-posting them next run
+                for future in list(futures):
+                    reap(future)
+    else:
+        for i, (story, video_path) in enumerate(to_upload):
+            print(f"\n[{i + 1}/{len(to_upload)}] {story['title']}")
+            try:
+                publish_id = upload_video(access_token, str(video_path), story, args.privacy)
+            except (requests.HTTPError, RuntimeError) as exc:
+                print(f"  ERROR: {exc}")
+                break
+
+            record(story, publish_id)
+
+            if i < len(to_upload) - 1:
+                print(f"  Waiting {args.delay}s before next upload...")
+                time.sleep(args.delay)
 
     print(f"\nDone.  {len(uploaded)} total video(s) uploaded to TikTok.")
 
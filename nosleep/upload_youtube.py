@@ -15,12 +15,17 @@ Usage:
     python upload_youtube.py --dry-run              # preview without uploading
     python upload_youtube.py --privacy public       # privacy for the first (immediate) video
     python upload_youtube.py --delay 30             # seconds to wait between uploads
+    python upload_youtube.py --concurrency 3        # upload up to 3 videos at once
 """
 
 import argparse
 import json
+import os
+import re
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -44,13 +49,30 @@ SCOPES = [
     "https://www.googleapis.com/auth/youtube.readonly",
 ]
 
+# Refresh the (1-hour) access token this long before it expires, so a run
+# doesn't start uploading on a token that lapses a minute in
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
 DEFAULT_PRIVACY      = "public"
 DEFAULT_DELAY        = 10   # seconds between uploads
 DEFAULT_LIMIT        = 3    # max uploads per run
 DEFAULT_STAGGER_HOURS = 8   # hours between scheduled videos (video 2 = +8h, video 3 = +16h, ...)
+DEFAULT_CONCURRENCY  = 1    # videos uploaded at once
 
 YOUTUBE_CATEGORY_ENTERTAINMENT = "24"
 
+# Appended to every video title; titles are capped at 100 chars by YouTube
+TITLE_SUFFIX   = " | r/nosleep Horror Story"
+TITLE_MAX_BODY = 100 - len(TITLE_SUFFIX)
+
+# Source link that build_description puts in every video description
+REDDIT_LINK_RE = re.compile(r"https://redd\.it/([a-z0-9]+)")
+
+# Resumable upload chunk size (must be a multiple of 256 KB). Each chunk is one
+# PUT round trip, so a few MB lets a typical video go up in a handful of requests
+CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB per chunk
+PROGRESS_STEP = 5             # redraw the upload percentage every 5 points
+
 TAGS = [
     "nosleep", "horror", "scary stories", "reddit horror",
     "creepy", "horror story", "short horror", "scary reddit",
@@ -59,7 +81,7 @@ TAGS = [
 
 # ── Authentication ─────────────────────────────────────────────────────────────
 
-def get_authenticated_service():
+def get_credentials() -> Credentials:
     """
     Authenticate with the YouTube Data API v3.
     On the first run this opens a browser window to authorise your Google account
@@ -70,8 +92,13 @@ def get_authenticated_service():
     if Path(TOKEN_FILE).exists():
         creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    # creds.expiry is naive UTC, as google-auth stores it
+    now      = datetime.now(timezone.utc).replace(tzinfo=None)
+    expiring = bool(creds and creds.refresh_token and creds.expiry
+                    and creds.expiry - now < TOKEN_REFRESH_MARGIN)
+
+    if not creds or not creds.valid or expiring:
+        if creds and creds.refresh_token and (creds.expired or expiring):
             creds.refresh(Request())
         else:
             if not Path(CLIENT_SECRETS).exists():
@@ -83,13 +110,31 @@ def get_authenticated_service():
             flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRETS, SCOPES)
             creds = flow.run_local_server(port=0)
 
-        with open(TOKEN_FILE, "w", encoding="utf-8") as fh:
-            fh.write(creds.to_json())
+        _write_json(TOKEN_FILE, json.loads(creds.to_json()))
+
+    return creds
 
-    return build("youtube", "v3", credentials=creds)
+
+def get_authenticated_service(creds: Credentials | None = None):
+    """
+    Build a YouTube API client, authenticating first unless `creds` is given.
+    Clients aren't thread-safe, so concurrent uploads each build their own
+    from one shared set of credentials.
+    """
+    return build("youtube", "v3", credentials=creds or get_credentials())
 
 # ── Upload tracking ────────────────────────────────────────────────────────────
 
+def _write_json(path: str, data, **dump_kwargs) -> None:
+    """Write JSON atomically: a crash mid-write leaves the previous file intact."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, **dump_kwargs)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
 def load_uploaded() -> dict:
     """Return the upload log (keyed by Reddit post ID)."""
     if Path(UPLOADED_FILE).exists():
@@ -99,19 +144,16 @@ def load_uploaded() -> dict:
 
 
 def save_uploaded(uploaded: dict) -> None:
-    with open(UPLOADED_FILE, "w", encoding="utf-8") as fh:
-        json.dump(uploaded, fh, indent=2, ensure_ascii=False)
+    _write_json(UPLOADED_FILE, uploaded, indent=2, ensure_ascii=False)
 
 # ── Metadata helpers ───────────────────────────────────────────────────────────
 
 def build_title(story: dict) -> str:
     """YouTube video title (max 100 chars)."""
-    suffix   = " | r/nosleep Horror Story"
-    max_body = 100 - len(suffix)
-    title    = story["title"]
-    if len(title) > max_body:
-        title = title[:max_body - 1].rstrip() + "\u2026"
-    return title + suffix
+    title = story["title"]
+    if len(title) > TITLE_MAX_BODY:
+        title = title[:TITLE_MAX_BODY - 1].rstrip() + "\u2026"
+    return title + TITLE_SUFFIX
 
 
 def build_description(story: dict) -> str:
@@ -123,8 +165,9 @@ def build_description(story: dict) -> str:
     url     = story["url"]
     title   = story["title"]
 
-    # First 200 words as a teaser
-    words   = story["body"].split()
+    # First 200 words as a teaser. maxsplit stops splitting there; anything
+    # after lands in one trailing item, which marks the preview as cut short
+    words   = story["body"].split(maxsplit=200)
     preview = " ".join(words[:200])
     if len(words) > 200:
         preview += "\u2026"
@@ -145,10 +188,9 @@ def build_description(story: dict) -> str:
 
 # ── Upload ─────────────────────────────────────────────────────────────────────
 
-def upload_video(youtube, video_path: str, story: dict, privacy: str,
-                 publish_at: str | None = None) -> str:
+def build_body(story: dict, privacy: str, publish_at: str | None = None) -> dict:
     """
-    Upload one video using the resumable protocol.  Returns the YouTube video ID.
+    The videos.insert request body (snippet + status) for a story.
     If publish_at is an RFC 3339 UTC string (e.g. '2026-03-02T18:00:00.000Z'),
     the video is uploaded as private and scheduled to go public at that time.
     """
@@ -160,7 +202,7 @@ def upload_video(youtube, video_path: str, story: dict, privacy: str,
     else:
         status_body["privacyStatus"] = privacy
 
-    body = {
+    return {
         "snippet": {
             "title":       build_title(story),
             "description": build_description(story),
@@ -170,11 +212,19 @@ def upload_video(youtube, video_path: str, story: dict, privacy: str,
         "status": status_body,
     }
 
+
+def upload_video(youtube, video_path: str, body: dict, progress: bool = True) -> str:
+    """
+    Upload one video using the resumable protocol.  Returns the YouTube video ID.
+    `body` is the request body from build_body().
+    The running percentage is only drawn on a terminal, and not at all with
+    progress=False (concurrent uploads would overwrite each other's line).
+    """
     media = MediaFileUpload(
         video_path,
         mimetype="video/mp4",
         resumable=True,
-        chunksize=256 * 1024,  # 256 KB chunks
+        chunksize=CHUNK_SIZE,
     )
 
     request = youtube.videos().insert(
@@ -183,27 +233,44 @@ def upload_video(youtube, video_path: str, story: dict, privacy: str,
         media_body=media,
     )
 
-    print(f"  Uploading: {Path(video_path).name}")
+    name = Path(video_path).name
+    print(f"  Uploading: {name}")
+    progress = progress and sys.stdout.isatty()
+    last_pct = -PROGRESS_STEP
     response = None
     while response is None:
         status, response = request.next_chunk()
-        if status:
+        if status and progress:
             pct = int(status.progress() * 100)
-            print(f"    {pct}% ...", end="\r")
-    print("    Upload complete.          ")
+            if pct - last_pct >= PROGRESS_STEP:
+                print(f"    {pct}% ...", end="\r")
+                last_pct = pct
+    if progress:
+        print("    Upload complete.          ")
+    else:
+        print(f"  Upload complete: {name}")
 
     return response["id"]
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
-def find_video_for_story(story_id: str, video_dir: Path) -> Path | None:
+def index_videos(video_dir: Path) -> dict[str, Path]:
     """
-    Locate the rendered .mp4 for a given Reddit post ID.
+    Map Reddit post ID -> rendered .mp4 with a single directory scan.
     Filename format: nosleep_NN_POSTID_SAFETITLE.mp4
     """
-    for path in video_dir.glob(f"nosleep_*_{story_id}_*.mp4"):
-        return path
-    return None
+    index: dict[str, Path] = {}
+    if not video_dir.is_dir():
+        return index
+    with os.scandir(video_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith("nosleep_") or not name.endswith(".mp4"):
+                continue
+            parts = name.split("_", 3)
+            if len(parts) == 4:
+                index.setdefault(parts[2], Path(entry.path))
+    return index
 
 # ── Main ───────────────────────────────────────────────────────────────────────
 
@@ -220,6 +287,10 @@ def main():
         "--delay", type=int, default=DEFAULT_DELAY,
         help="Seconds to wait between uploads.",
     )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help="Number of videos to upload at once (with > 1, --delay staggers the starts).",
+    )
     parser.add_argument(
         "--privacy", choices=["private", "unlisted", "public"], default=DEFAULT_PRIVACY,
         help="YouTube privacy setting for uploaded videos.",
@@ -249,36 +320,47 @@ def main():
     with open(STORIES_FILE, encoding="utf-8") as fh:
         stories = json.load(fh)
 
-    video_dir = Path(VIDEO_OUTPUT_DIR)
-    uploaded  = load_uploaded()
+    videos   = index_videos(Path(VIDEO_OUTPUT_DIR))
+    uploaded = load_uploaded()
 
     # --sync: fetch channel videos from YouTube and match to stories
     if args.sync:
         print("Syncing uploaded.json with your YouTube channel...")
         youtube      = get_authenticated_service()
+        story_by_id    = {s["id"]: s for s in stories}
         story_by_title = {s["title"]: s for s in stories}
         next_page    = None
         synced       = 0
+        # Walk the channel's uploads playlist: 1 quota unit per page of 50,
+        # against 100 for search.list(forMine=True), and it includes videos
+        # too new (or private/scheduled) to be in the search index yet
+        channel    = youtube.channels().list(part="contentDetails", mine=True).execute()
+        uploads_id = channel["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
         while True:
-            kwargs = dict(part="snippet", forMine=True, type="video", maxResults=50)
+            kwargs = dict(part="snippet", playlistId=uploads_id, maxResults=50)
             if next_page:
                 kwargs["pageToken"] = next_page
-            resp = youtube.search().list(**kwargs).execute()
+            resp = youtube.playlistItems().list(**kwargs).execute()
             for item in resp.get("items", []):
-                vid_id    = item["id"]["videoId"]
-                yt_title  = item["snippet"]["title"]
-                # Strip the suffix we add so we can match back to the story title
-                base_title = yt_title.replace(" | r/nosleep Horror Story", "").strip()
-                story      = story_by_title.get(base_title)
+                snippet = item["snippet"]
+                vid_id  = snippet["resourceId"]["videoId"]
+                # Match on the post ID in the description's source link — unlike
+                # the title, it survives truncation to YouTube's 100 chars
+                link  = REDDIT_LINK_RE.search(snippet.get("description", ""))
+                story = story_by_id.get(link.group(1)) if link else None
+                if story is None:
+                    # Strip the suffix we add so we can match back to the story title
+                    base_title = snippet["title"].replace(TITLE_SUFFIX, "").strip()
+                    story      = story_by_title.get(base_title)
                 if story and story["id"] not in uploaded:
                     uploaded[story["id"]] = {
                         "youtube_id":  vid_id,
                         "youtube_url": f"https://www.youtube.com/watch?v={vid_id}",
                         "title":       story["title"],
                         "author":      story.get("author", ""),
-                        "uploaded_at": item["snippet"]["publishedAt"],
+                        "uploaded_at": snippet["publishedAt"],
                     }
-                    print(f"  Synced: [{story['id']}] {base_title}")
+                    print(f"  Synced: [{story['id']}] {story['title']}")
                     synced += 1
             next_page = resp.get("nextPageToken")
             if not next_page:
@@ -292,7 +374,7 @@ def main():
         sid = story["id"]
         if sid in uploaded:
             continue
-        video_path = find_video_for_story(sid, video_dir)
+        video_path = videos.get(sid)
         if video_path is None:
             continue  # not rendered yet — skip
         pending.append((story, video_path))
@@ -316,32 +398,29 @@ def main():
             print()
         return
 
-    youtube = get_authenticated_service()
     run_start = datetime.now(timezone.utc)
 
-    for i, (story, video_path) in enumerate(to_upload):
-        # Compute publish_at for staggered scheduling
+    def schedule(i: int) -> str | None:
+        """publish_at for the i-th video of the run (staggered scheduling)."""
         if args.no_stagger or i == 0:
-            publish_at = None  # first video (or stagger disabled) — post immediately
-        else:
-            publish_at = (
-                run_start + timedelta(hours=args.stagger_hours * i)
-            ).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+            return None  # first video (or stagger disabled) — post immediately
+        return (
+            run_start + timedelta(hours=args.stagger_hours * i)
+        ).strftime("%Y-%m-%dT%H:%M:%S.000Z")
 
+    def announce(i: int, story: dict, publish_at: str | None) -> None:
         print(f"\n[{i + 1}/{len(to_upload)}] {story['title']}")
         if publish_at:
             print(f"  Scheduled: {publish_at} (+{args.stagger_hours * i:.0f}h)")
         else:
             print(f"  Privacy  : {args.privacy} (immediate)")
 
-        try:
-            video_id = upload_video(youtube, str(video_path), story, args.privacy, publish_at)
-        except HttpError as exc:
-            print(f"  ERROR: {exc}")
-            if exc.status_code == 403:
-                print("  Quota likely exceeded.  Try again tomorrow or raise your quota limit.")
-            break  # stop the run on API errors
+    def report_error(exc: HttpError) -> None:
+        print(f"  ERROR: {exc}")
+        if exc.status_code == 403:
+            print("  Quota likely exceeded.  Try again tomorrow or raise your quota limit.")
 
+    def record(story: dict, video_id: str, publish_at: str | None) -> None:
         uploaded[story["id"]] = {
             "youtube_id":  video_id,
             "youtube_url": f"https://www.youtube.com/watch?v={video_id}",
@@ -356,9 +435,85 @@ def main():
         else:
             print(f"  Live at: https://www.youtube.com/watch?v={video_id}")
 
-        if i < len(to_upload) - 1:
-            print(f"  Waiting {args.delay}s before next upload...")
-            time.sleep(args.delay)
+    if args.concurrency > 1:
+        # Each worker thread gets its own API client built from shared
+        # credentials; results are recorded here on the main thread.
+        creds = get_credentials()
+        local = threading.local()
+
+        def upload(video_path: Path, body: dict) -> str:
+            if not hasattr(local, "youtube"):
+                local.youtube = get_authenticated_service(creds)
+            return upload_video(local.youtube, str(video_path), body, progress=False)
+
+        futures   = {}
+        quota_hit = False
+
+        def reap(future) -> None:
+            nonlocal quota_hit
+            story, publish_at = futures.pop(future)
+            if future.cancelled():
+                return
+            print(f"\n[{story['id']}] {story['title']}")
+            try:
+                video_id = future.result()
+            except HttpError as exc:
+                report_error(exc)
+                quota_hit = quota_hit or exc.status_code == 403
+                return
+            except Exception as exc:  # network error, failed token refresh, ...
+                print(f"  ERROR: {exc}")
+                return
+            record(story, video_id, publish_at)
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            try:
+                for i, (story, video_path) in enumerate(to_upload):
+                    if i:
+                        time.sleep(args.delay)
+                    # Hand the pool no more uploads than it has workers, so
+                    # results are recorded as they land and a quota error
+                    # stops the run before the rest are sent
+                    for future in [f for f in futures if f.done()]:
+                        reap(future)
+                    while len(futures) >= args.concurrency:
+                        for future in wait(futures, return_when=FIRST_COMPLETED).done:
+                            reap(future)
+                    if quota_hit:
+                        break  # stop the run, as the serial path does
+                    publish_at = schedule(i)
+                    announce(i, story, publish_at)
+                    body   = build_body(story, args.privacy, publish_at)
+                    future = pool.submit(upload, video_path, body)
+                    futures[future] = (story, publish_at)
+            except KeyboardInterrupt:
+                print("\nInterrupted \u2014 finishing uploads already in progress...")
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                # Uploads already in flight still land on the channel, so wait
+                # for them and record them rather than re-uploading next run
+                for future in list(futures):
+                    reap(future)
+    else:
+        youtube = get_authenticated_service()
+
+        for i, (story, video_path) in enumerate(to_upload):
+            publish_at = schedule(i)
+            announce(i, story, publish_at)
+
+            try:
+                body     = build_body(story, args.privacy, publish_at)
+                video_id = upload_video(youtube, str(video_path), body)
+            except HttpError as exc:
+                report_error(exc)
+                break  # stop the run on API errors
+
+            record(story, video_id, publish_at)
+
+            if i < len(to_upload) - 1:
+                print(f"  Waiting {args.delay}s before next upload...")
+                time.sleep(args.delay)
 
     total = sum(1 for v in uploaded.values() if "youtube_id" in v)
     print(f"\nDone.  {total} video(s) uploaded to date.")